@@ -6,47 +6,179 @@ Save as: .github/scripts/hot_swap_memory.py
 """
 
 import argparse
+import asyncio
 import json
+import logging
 import time
 import random
 import sys
 import os
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Dict, Any, AsyncIterator, Optional, Sequence, Tuple
 
-def log(message):
-    """Simple logging function"""
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
-def set_github_output(name, value):
-    """Set GitHub Actions output using the new format"""
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Traffic switching strategies understood by MemoryAgentSwapper
+SWAP_STRATEGIES = ('blue-green', 'canary', 'rolling')
+
+# Strategies that stage the new version beside the live one, so it can be
+# deployed while the pre-swap checks run
+OVERLAPPED_DEPLOY_STRATEGIES = ('blue-green',)
+
+# Pre-swap checks and their simulated failure rates
+PRE_SWAP_CHECKS = (
+    ('Memory availability', 0.02),    # 98% success
+    ('System resources', 0.01),       # 99% success
+    ('Network connectivity', 0.01),   # 99% success
+    ('Version compatibility', 0.01)   # 99% success
+)
+
+# Simulated reasons for a failed deployment
+DEPLOYMENT_ERROR_CODES = ('RESOURCE_LIMIT', 'CONFIG_ERROR', 'TIMEOUT')
+
+# Canary progression (seconds are scaled down for the demo)
+CANARY_TRAFFIC_STEPS = (10, 50, 100)
+CANARY_SHIFT_TIME = 0.1
+CANARY_OBSERVATION_WINDOW = 0.5
+
+# Post-swap health check SLOs
+MAX_ERROR_RATE = 0.02
+MAX_RESPONSE_TIME_MS = 300
+
+# Healthy range of each post-swap health metric
+HEALTH_METRIC_RANGES = (
+    ('response_time', 100, 300),
+    ('error_rate', 0, 0.02),
+    ('memory_usage', 0.4, 0.7),
+    ('cpu_usage', 0.3, 0.6),
+    ('cache_hit_rate', 0.8, 0.95)
+)
+
+# Post-swap health polling (seconds are scaled down for the demo)
+HEALTH_POLL_INTERVAL = 0.25
+HEALTH_STABLE_SAMPLES = 3
+DEGRADED_SAMPLE_RATE = 0.02
+
+# Resources released when the old version is cleaned up
+FREED_RESOURCES = ('containers', 'network_routes', 'config_maps')
+
+# Simulation draws are generated in batches of this size
+RANDOM_BATCH_SIZE = 64
+
+logger = logging.getLogger(__name__)
+log = logger.info
+
+def set_github_outputs(outputs: Dict[str, Any]):
+    """Set GitHub Actions outputs using the new format, in a single write"""
+    lines = ''.join(f"{name}={value}\n" for name, value in outputs.items())
     try:
         if 'GITHUB_OUTPUT' in os.environ:
             with open(os.environ['GITHUB_OUTPUT'], 'a') as f:
-                f.write(f"{name}={value}\n")
+                f.write(lines)
         else:
             # Fallback for local testing
-            print(f"OUTPUT: {name}={value}")
+            sys.stdout.write(''.join(f"OUTPUT: {line}\n" for line in lines.splitlines()))
     except Exception as e:
-        print(f"Warning: Could not set output {name}: {e}")
+        print(f"Warning: Could not set outputs {', '.join(outputs)}: {e}")
 
-class MemoryAgentSwapper:
-    """Handles hot-swapping of memory agents"""
+def dump_json(obj: Any) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when it is installed"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+class PhaseResult:
+    """Outcome of a single swap phase"""
+    
+    __slots__ = ('phase', 'status', 'duration_ms', 'message', 'extras')
     
-    def __init__(self):
-        self.swap_strategies = {
-            'blue-green': self._blue_green_swap,
-            'canary': self._canary_swap,
-            'rolling': self._rolling_swap
+    def __init__(self, phase: str, status: str, duration_ms: float, message: str = '',
+                 extras: Optional[Dict[str, Any]] = None):
+        self.phase = phase
+        self.status = status
+        self.duration_ms = duration_ms
+        self.message = message
+        self.extras = extras if extras is not None else {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flatten into the phase record written to the results file"""
+        return {
+            'phase': self.phase,
+            'status': self.status,
+            'duration_ms': self.duration_ms,
+            'message': self.message,
+            **self.extras
         }
+
+class MemoryAgentSwapper:
+    """Handles hot-swapping of memory agents
+    
+    Phase methods are coroutines so independent phases can overlap while the
+    simulated waits use asyncio.sleep instead of blocking the interpreter.
+    """
+    
+    __slots__ = ('_rng', '_uniforms', '_next_uniform', '_rollback_token')
+    
+    def __init__(self, seed: Optional[int] = None):
+        # All simulation draws come from one seeded generator so runs can be
+        # reproduced; uniforms are generated a batch at a time.
+        self._rng = np.random.default_rng(seed) if HAS_NUMPY else random.Random(seed)
+        self._uniforms = []
+        self._next_uniform = 0
+        self._rollback_token = None
         log("Memory agent swapper initialized")
     
-    def perform_swap(self, from_version: str, to_version: str, strategy: str, environment: str, validation_time: int) -> Dict[str, Any]:
+    def _u(self) -> float:
+        """Next uniform draw in [0, 1) from the pre-generated batch"""
+        if self._next_uniform >= len(self._uniforms):
+            if HAS_NUMPY:
+                self._uniforms = self._rng.random(RANDOM_BATCH_SIZE).tolist()
+            else:
+                self._uniforms = [self._rng.random() for _ in range(RANDOM_BATCH_SIZE)]
+            self._next_uniform = 0
+        value = self._uniforms[self._next_uniform]
+        self._next_uniform += 1
+        return value
+    
+    def _uniform(self, low: float, high: float) -> float:
+        """Uniform draw in [low, high)"""
+        return low + (high - low) * self._u()
+    
+    def _randint(self, low: int, high: int) -> int:
+        """Integer draw in [low, high], inclusive like random.randint"""
+        return low + int(self._u() * (high - low + 1))
+    
+    def _choice(self, options: Sequence[Any]) -> Any:
+        """Pick one of options"""
+        return options[int(self._u() * len(options))]
+    
+    async def perform_swap(self, from_version: str, to_version: str, strategy: str, environment: str, validation_time: int) -> Dict[str, Any]:
         """Perform memory agent hot swap"""
+        swap_result = self.new_swap(from_version, to_version, strategy, environment, validation_time)
+        
+        async for phase in self.stream_swap(swap_result):
+            swap_result['phases'].append(phase.to_dict())
         
-        swap_result = {
+        return swap_result
+    
+    def new_swap(self, from_version: str, to_version: str, strategy: str, environment: str, validation_time: int) -> Dict[str, Any]:
+        """Create the swap record that stream_swap fills in"""
+        if strategy not in SWAP_STRATEGIES:
+            raise ValueError(f"Unknown swap strategy: {strategy}")
+        
+        return {
             'swap_id': f"mem-swap-{int(time.time())}",
-            'start_time': datetime.now().isoformat(),
+            'start_time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
             'from_version': from_version,
             'to_version': to_version,
             'strategy': strategy,
@@ -55,6 +187,22 @@ class MemoryAgentSwapper:
             'phases': [],
             'swap_status': 'in_progress'
         }
+    
+    async def stream_swap(self, swap_result: Dict[str, Any]) -> AsyncIterator[PhaseResult]:
+        """Run the swap described by swap_result, yielding each phase as it completes
+        
+        Status, final version and timing are recorded on swap_result. Phases are
+        only yielded, so the caller decides whether to keep or persist them.
+        """
+        started = time.monotonic()
+        from_version = swap_result['from_version']
+        to_version = swap_result['to_version']
+        strategy = swap_result['strategy']
+        environment = swap_result['environment']
+        validation_time = swap_result['validation_time']
+        
+        # Arm the rollback before anything changes so reverting is a route flip
+        self._prestage_rollback(from_version)
         
         try:
             log(f"Starting memory agent swap: {from_version} → {to_version}")
@@ -62,38 +210,53 @@ class MemoryAgentSwapper:
             
             # Phase 1: Pre-swap validation
             log("🔍 Phase 1: Pre-swap validation")
-            pre_validation = self._pre_swap_validation(from_version, to_version)
-            swap_result['phases'].append(pre_validation)
+            if strategy in OVERLAPPED_DEPLOY_STRATEGIES:
+                # Phase 2 starts alongside phase 1 - the new version is staged next
+                # to the one still serving traffic, so nothing is exposed until the
+                # traffic switch.
+                log(f"🚀 Phase 2: Deploying memory agent {to_version}")
+                pre_validation, deployment = await self._validate_while_deploying(from_version, to_version, environment)
+            else:
+                pre_validation, deployment = await self._pre_swap_validation(from_version, to_version), None
+            yield pre_validation
             
-            if pre_validation['status'] != 'success':
-                raise Exception(f"Pre-swap validation failed: {pre_validation['message']}")
+            if pre_validation.status != 'success':
+                raise Exception(f"Pre-swap validation failed: {pre_validation.message}")
             
             # Phase 2: Deploy new version
-            log(f"🚀 Phase 2: Deploying memory agent {to_version}")
-            deployment = self._deploy_new_version(to_version, environment)
-            swap_result['phases'].append(deployment)
+            if deployment is None:
+                log(f"🚀 Phase 2: Deploying memory agent {to_version}")
+                deployment = await self._deploy_new_version(to_version, environment)
+            yield deployment
             
-            if deployment['status'] != 'success':
-                raise Exception(f"Deployment failed: {deployment['message']}")
+            if deployment.status != 'success':
+                raise Exception(f"Deployment failed: {deployment.message}")
             
             # Phase 3: Traffic switching (strategy-dependent)
             log(f"🔄 Phase 3: Traffic switching using {strategy} strategy")
-            traffic_switch = self.swap_strategies[strategy](from_version, to_version)
-            swap_result['phases'].append(traffic_switch)
+            # new_swap has already rejected anything outside SWAP_STRATEGIES
+            if strategy == 'blue-green':
+                traffic_switch = await self._blue_green_swap(from_version, to_version)
+            elif strategy == 'canary':
+                traffic_switch = await self._canary_swap(from_version, to_version)
+            else:
+                traffic_switch = await self._rolling_swap(from_version, to_version)
+            yield traffic_switch
             
-            if traffic_switch['status'] != 'success':
-                raise Exception(f"Traffic switching failed: {traffic_switch['message']}")
+            if traffic_switch.status != 'success':
+                raise Exception(f"Traffic switching failed: {traffic_switch.message}")
             
             # Phase 4: Post-swap validation
             log(f"✅ Phase 4: Post-swap validation ({validation_time}s)")
-            validation = self._post_swap_validation(to_version, validation_time)
-            swap_result['phases'].append(validation)
+            validation = await self._post_swap_validation(to_version, validation_time)
+            yield validation
             
-            if validation['status'] == 'success':
+            if validation.status == 'success':
                 # Phase 5: Cleanup old version
                 log(f"🧹 Phase 5: Cleaning up old version {from_version}")
-                cleanup = self._cleanup_old_version(from_version)
-                swap_result['phases'].append(cleanup)
+                cleanup = await self._cleanup_old_version(from_version)
+                self._rollback_token = None  # old version is gone, nothing to restore
+                yield cleanup
                 
                 swap_result['swap_status'] = 'success'
                 swap_result['final_version'] = to_version
@@ -101,8 +264,8 @@ class MemoryAgentSwapper:
             else:
                 # Rollback on validation failure
                 log("🔙 Validation failed - initiating rollback")
-                rollback = self._rollback_to_previous(from_version)
-                swap_result['phases'].append(rollback)
+                rollback = await self._rollback_to_previous(from_version)
+                yield rollback
                 
                 swap_result['swap_status'] = 'rolled_back'
                 swap_result['final_version'] = from_version
@@ -114,207 +277,358 @@ class MemoryAgentSwapper:
             
             # Attempt emergency rollback
             try:
-                rollback = self._rollback_to_previous(from_version)
-                swap_result['phases'].append(rollback)
+                rollback = await self._rollback_to_previous(from_version)
+                yield rollback
                 swap_result['final_version'] = from_version
             except Exception as rollback_error:
                 swap_result['rollback_error'] = str(rollback_error)
         
-        swap_result['end_time'] = datetime.now().isoformat()
-        swap_result['total_duration'] = self._calculate_duration(swap_result['start_time'], swap_result['end_time'])
-        
-        return swap_result
+        swap_result['end_time'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        swap_result['total_duration'] = time.monotonic() - started
     
-    def _pre_swap_validation(self, from_version: str, to_version: str) -> Dict[str, Any]:
+    async def _pre_swap_validation(self, from_version: str, to_version: str) -> PhaseResult:
         """Validate system state before swap"""
-        time.sleep(1)  # Simulate validation time
-        
-        # Simulate validation checks with better success rate
-        checks = [
-            ('Memory availability', random.random() > 0.02),  # 98% success
-            ('System resources', random.random() > 0.01),     # 99% success
-            ('Network connectivity', random.random() > 0.01), # 99% success
-            ('Version compatibility', random.random() > 0.01) # 99% success
-        ]
+        # Checks are independent, so run them concurrently
+        checks = await asyncio.gather(*(
+            self._run_pre_swap_check(check, failure_rate)
+            for check, failure_rate in PRE_SWAP_CHECKS
+        ))
         
         failed_checks = [check for check, passed in checks if not passed]
         
         if failed_checks:
-            return {
-                'phase': 'pre_validation',
-                'status': 'failed',
-                'duration_ms': 1000,
-                'message': f"Validation failed: {', '.join(failed_checks)}",
-                'checks_passed': len(checks) - len(failed_checks),
-                'total_checks': len(checks)
-            }
+            return PhaseResult(
+                phase='pre_validation',
+                status='failed',
+                duration_ms=1000,
+                message=f"Validation failed: {', '.join(failed_checks)}",
+                extras={
+                    'checks_passed': len(checks) - len(failed_checks),
+                    'total_checks': len(checks)
+                }
+            )
         else:
-            return {
-                'phase': 'pre_validation',
-                'status': 'success',
-                'duration_ms': 1000,
-                'message': 'All pre-swap validations passed',
-                'checks_passed': len(checks),
-                'total_checks': len(checks)
-            }
+            return PhaseResult(
+                phase='pre_validation',
+                status='success',
+                duration_ms=1000,
+                message='All pre-swap validations passed',
+                extras={
+                    'checks_passed': len(checks),
+                    'total_checks': len(checks)
+                }
+            )
+    
+    async def _validate_while_deploying(self, from_version: str, to_version: str,
+                                        environment: str) -> Tuple[PhaseResult, Optional[PhaseResult]]:
+        """Deploy while pre-swap validation runs; the deployment is cancelled if validation fails"""
+        deploying = asyncio.create_task(self._deploy_new_version(to_version, environment))
+        try:
+            pre_validation = await self._pre_swap_validation(from_version, to_version)
+        except BaseException:
+            deploying.cancel()
+            raise
+        
+        if pre_validation.status != 'success':
+            deploying.cancel()
+            return pre_validation, None
+        
+        return pre_validation, await deploying
+    
+    async def _run_pre_swap_check(self, check: str, failure_rate: float) -> Tuple[str, bool]:
+        """Run a single pre-swap check"""
+        await asyncio.sleep(1)  # Simulate check round-trip
+        return check, self._u() > failure_rate
     
-    def _deploy_new_version(self, version: str, environment: str) -> Dict[str, Any]:
+    async def _deploy_new_version(self, version: str, environment: str) -> PhaseResult:
         """Deploy new memory agent version"""
-        deployment_time = random.uniform(1, 2)  # 1-2 seconds for faster demo
-        time.sleep(deployment_time)
+        deployment_time = self._uniform(1, 2)  # 1-2 seconds for faster demo
+        await asyncio.sleep(deployment_time)
         
         # 98% success rate for deployment
-        success = random.random() > 0.02
+        success = self._u() > 0.02
         
         if success:
-            return {
-                'phase': 'deployment',
-                'status': 'success',
-                'duration_ms': deployment_time * 1000,
-                'message': f'Memory agent {version} deployed successfully',
-                'version': version,
-                'environment': environment,
-                'instances_deployed': random.randint(2, 4)
-            }
+            return PhaseResult(
+                phase='deployment',
+                status='success',
+                duration_ms=deployment_time * 1000,
+                message=f'Memory agent {version} deployed successfully',
+                extras={
+                    'version': version,
+                    'environment': environment,
+                    'instances_deployed': self._randint(2, 4)
+                }
+            )
         else:
-            return {
-                'phase': 'deployment',
-                'status': 'failed',
-                'duration_ms': deployment_time * 1000,
-                'message': f'Deployment of {version} failed',
-                'error_code': random.choice(['RESOURCE_LIMIT', 'CONFIG_ERROR', 'TIMEOUT'])
-            }
+            return PhaseResult(
+                phase='deployment',
+                status='failed',
+                duration_ms=deployment_time * 1000,
+                message=f'Deployment of {version} failed',
+                extras={
+                    'error_code': self._choice(DEPLOYMENT_ERROR_CODES)
+                }
+            )
     
-    def _blue_green_swap(self, from_version: str, to_version: str) -> Dict[str, Any]:
+    async def _blue_green_swap(self, from_version: str, to_version: str) -> PhaseResult:
         """Blue-green deployment strategy"""
-        time.sleep(0.5)  # Faster for demo
+        await asyncio.sleep(0.5)  # Faster for demo
         
-        return {
-            'phase': 'traffic_switch',
-            'strategy': 'blue-green',
-            'status': 'success',
-            'duration_ms': 500,
-            'message': f'Traffic switched from blue ({from_version}) to green ({to_version})',
-            'traffic_split': {'blue': 0, 'green': 100},
-            'switch_type': 'immediate'
-        }
+        return PhaseResult(
+            phase='traffic_switch',
+            status='success',
+            duration_ms=500,
+            message=f'Traffic switched from blue ({from_version}) to green ({to_version})',
+            extras={
+                'strategy': 'blue-green',
+                'traffic_split': {'blue': 0, 'green': 100},
+                'switch_type': 'immediate'
+            }
+        )
     
-    def _canary_swap(self, from_version: str, to_version: str) -> Dict[str, Any]:
-        """Canary deployment strategy"""
-        time.sleep(1.5)  # Faster for demo
+    async def _canary_swap(self, from_version: str, to_version: str) -> PhaseResult:
+        """Canary deployment strategy, watching health between traffic steps"""
+        started = time.monotonic()
+        canary_steps = []
         
-        # Simulate canary progression: 10% → 50% → 100%
-        canary_steps = [
-            ('10% canary traffic', 10),
-            ('50% canary traffic', 50),  
-            ('100% canary traffic', 100)
-        ]
+        shift = await self._prepare_traffic_shift(CANARY_TRAFFIC_STEPS[0])
         
-        return {
-            'phase': 'traffic_switch',
-            'strategy': 'canary',
-            'status': 'success',
-            'duration_ms': 1500,
-            'message': f'Canary deployment completed: {from_version} → {to_version}',
-            'traffic_split': {'stable': 0, 'canary': 100},
-            'canary_steps': canary_steps,
-            'switch_type': 'gradual'
-        }
+        for step, percent in enumerate(CANARY_TRAFFIC_STEPS):
+            canary_steps.append(shift)
+            
+            # Stage the next shift while this step is being observed
+            if step + 1 < len(CANARY_TRAFFIC_STEPS):
+                metrics, shift = await asyncio.gather(
+                    self._observe_canary(),
+                    self._prepare_traffic_shift(CANARY_TRAFFIC_STEPS[step + 1])
+                )
+            else:
+                metrics = await self._observe_canary()
+            
+            failure_reason = self._detect_slo_breach(metrics)
+            if failure_reason:
+                # Abort at this step rather than promoting a bad canary further
+                return PhaseResult(
+                    phase='traffic_switch',
+                    status='failed',
+                    duration_ms=(time.monotonic() - started) * 1000,
+                    message=f'Canary aborted at {percent}% traffic: {failure_reason}',
+                    extras={
+                        'strategy': 'canary',
+                        'traffic_split': {'stable': 100, 'canary': 0},
+                        'canary_steps': canary_steps,
+                        'aborted_at_percent': percent,
+                        'canary_metrics': metrics,
+                        'switch_type': 'gradual'
+                    }
+                )
+        
+        return PhaseResult(
+            phase='traffic_switch',
+            status='success',
+            duration_ms=(time.monotonic() - started) * 1000,
+            message=f'Canary deployment completed: {from_version} → {to_version}',
+            extras={
+                'strategy': 'canary',
+                'traffic_split': {'stable': 0, 'canary': 100},
+                'canary_steps': canary_steps,
+                'switch_type': 'gradual'
+            }
+        )
     
-    def _rolling_swap(self, from_version: str, to_version: str) -> Dict[str, Any]:
+    async def _prepare_traffic_shift(self, percent: int) -> Tuple[str, int]:
+        """Push the route configuration sending percent of traffic to the canary, returning its canary step"""
+        await asyncio.sleep(CANARY_SHIFT_TIME)
+        log(f"Route configuration staged: {percent}% canary traffic")
+        return f'{percent}% canary traffic', percent
+    
+    async def _observe_canary(self) -> Dict[str, float]:
+        """Watch the canary for one observation window and sample its health"""
+        await asyncio.sleep(CANARY_OBSERVATION_WINDOW)
+        return self._sample_health_metrics()
+    
+    async def _rolling_swap(self, from_version: str, to_version: str) -> PhaseResult:
         """Rolling update strategy"""
-        time.sleep(1)  # Faster for demo
+        await asyncio.sleep(1)  # Faster for demo
         
-        instances_updated = random.randint(3, 6)
+        instances_updated = self._randint(3, 6)
         
-        return {
-            'phase': 'traffic_switch',
-            'strategy': 'rolling',
-            'status': 'success',
-            'duration_ms': 1000,
-            'message': f'Rolling update completed: {instances_updated} instances updated',
-            'instances_updated': instances_updated,
-            'update_batch_size': 1,
-            'switch_type': 'rolling'
-        }
+        return PhaseResult(
+            phase='traffic_switch',
+            status='success',
+            duration_ms=1000,
+            message=f'Rolling update completed: {instances_updated} instances updated',
+            extras={
+                'strategy': 'rolling',
+                'instances_updated': instances_updated,
+                'update_batch_size': 1,
+                'switch_type': 'rolling'
+            }
+        )
     
-    def _post_swap_validation(self, version: str, validation_time: int) -> Dict[str, Any]:
-        """Validate new version after swap"""
-        # Scale down validation time for demo (but report actual time)
-        actual_sleep = min(validation_time / 20, 2)  # Max 2 seconds sleep, much faster
-        time.sleep(actual_sleep)
-        
-        # Validation metrics
-        metrics = {
-            'response_time': random.uniform(100, 300),
-            'error_rate': random.uniform(0, 0.02),
-            'memory_usage': random.uniform(0.4, 0.7),
-            'cpu_usage': random.uniform(0.3, 0.6),
-            'cache_hit_rate': random.uniform(0.8, 0.95)
-        }
+    async def _post_swap_validation(self, version: str, validation_time: int) -> PhaseResult:
+        """Validate new version after swap by polling its health until stable or breached"""
+        # Scale down validation window for demo (max 2 seconds)
+        validation_window = min(validation_time / 20, 2)
         
-        # 95% validation success rate (higher than before)
-        validation_success = random.random() > 0.05
+        started = time.monotonic()
+        samples_taken = 0
+        consecutive_ok = 0
+        metrics = {}
+        
+        while True:
+            metrics = self._sample_health_metrics()
+            samples_taken += 1
+            
+            failure_reason = self._detect_slo_breach(metrics)
+            if failure_reason:
+                # Abort as soon as an SLO breach is observed
+                return PhaseResult(
+                    phase='validation',
+                    status='failed',
+                    duration_ms=(time.monotonic() - started) * 1000,
+                    message=f'Memory agent {version} validation failed',
+                    extras={
+                        'validation_metrics': metrics,
+                        'samples_taken': samples_taken,
+                        'failure_reason': failure_reason
+                    }
+                )
+            
+            consecutive_ok += 1
+            if consecutive_ok >= HEALTH_STABLE_SAMPLES:
+                break
+            if time.monotonic() - started + HEALTH_POLL_INTERVAL > validation_window:
+                break
+            
+            await asyncio.sleep(HEALTH_POLL_INTERVAL)
         
         # Calculate performance improvement
-        performance_improvement = random.uniform(15, 35) if validation_success else 0
-        
-        if validation_success:
-            return {
-                'phase': 'validation',
-                'status': 'success',
-                'duration_ms': validation_time * 1000,
-                'message': f'Memory agent {version} validation passed',
+        performance_improvement = self._uniform(15, 35)
+        
+        return PhaseResult(
+            phase='validation',
+            status='success',
+            duration_ms=(time.monotonic() - started) * 1000,
+            message=f'Memory agent {version} validation passed',
+            extras={
                 'validation_metrics': metrics,
+                'samples_taken': samples_taken,
                 'performance_improvement': performance_improvement,
                 'meets_sla': True
             }
-        else:
-            return {
-                'phase': 'validation',
-                'status': 'failed',
-                'duration_ms': validation_time * 1000,
-                'message': f'Memory agent {version} validation failed',
-                'validation_metrics': metrics,
-                'failure_reason': random.choice([
-                    'High error rate detected',
-                    'Response time threshold exceeded',
-                    'Memory leak detected',
-                    'Cache performance degraded'
-                ])
-            }
+        )
     
-    def _cleanup_old_version(self, old_version: str) -> Dict[str, Any]:
+    def _sample_health_metrics(self) -> Dict[str, float]:
+        """Take one health sample from the new version"""
+        metrics = {metric: self._uniform(low, high) for metric, low, high in HEALTH_METRIC_RANGES}
+        
+        # Occasionally the new version regresses on errors or latency
+        if self._u() < DEGRADED_SAMPLE_RATE:
+            if self._u() < 0.5:
+                metrics['error_rate'] = self._uniform(0.03, 0.08)
+            else:
+                metrics['response_time'] = self._uniform(320, 600)
+        
+        return metrics
+    
+    def _detect_slo_breach(self, metrics: Dict[str, float]) -> Optional[str]:
+        """Return the failure reason if a health sample breaches the SLOs"""
+        if metrics['error_rate'] > MAX_ERROR_RATE:
+            return 'High error rate detected'
+        if metrics['response_time'] > MAX_RESPONSE_TIME_MS:
+            return 'Response time threshold exceeded'
+        return None
+    
+    async def _cleanup_old_version(self, old_version: str) -> PhaseResult:
         """Clean up old version resources"""
-        time.sleep(0.3)  # Faster cleanup
+        await asyncio.sleep(0.3)  # Faster cleanup
         
-        return {
-            'phase': 'cleanup',
-            'status': 'success',
-            'duration_ms': 300,
-            'message': f'Old version {old_version} cleaned up successfully',
-            'resources_freed': ['containers', 'network_routes', 'config_maps'],
-            'storage_freed_mb': random.randint(100, 500)
+        return PhaseResult(
+            phase='cleanup',
+            status='success',
+            duration_ms=300,
+            message=f'Old version {old_version} cleaned up successfully',
+            extras={
+                'resources_freed': FREED_RESOURCES,
+                'storage_freed_mb': self._randint(100, 500)
+            }
+        )
+    
+    def _prestage_rollback(self, previous_version: str):
+        """Snapshot the current traffic route so a rollback can restore it instantly"""
+        self._rollback_token = {
+            'version': previous_version,
+            'traffic_route': {'active_version': previous_version, 'traffic_split': {previous_version: 100}}
         }
     
-    def _rollback_to_previous(self, previous_version: str) -> Dict[str, Any]:
+    async def _rollback_to_previous(self, previous_version: str) -> PhaseResult:
         """Rollback to previous version"""
-        time.sleep(0.8)  # Faster rollback
+        token = self._rollback_token
+        self._rollback_token = None
         
-        return {
-            'phase': 'rollback',
-            'status': 'success',
-            'duration_ms': 800,
-            'message': f'Successfully rolled back to {previous_version}',
-            'rollback_reason': 'Validation failure',
-            'traffic_restored': True
-        }
+        if token is not None and token['version'] == previous_version:
+            # Fast path: restore the pre-staged route, no redeploy or re-validation
+            return PhaseResult(
+                phase='rollback',
+                status='success',
+                duration_ms=1,
+                message=f'Successfully rolled back to {previous_version}',
+                extras={
+                    'rollback_reason': 'Validation failure',
+                    'traffic_restored': True,
+                    'restored_route': token['traffic_route'],
+                    'prestaged': True
+                }
+            )
+        
+        await asyncio.sleep(0.8)  # Faster rollback
+        
+        return PhaseResult(
+            phase='rollback',
+            status='success',
+            duration_ms=800,
+            message=f'Successfully rolled back to {previous_version}',
+            extras={
+                'rollback_reason': 'Validation failure',
+                'traffic_restored': True,
+                'prestaged': False
+            }
+        )
+
+async def stream_swap_results(swapper: MemoryAgentSwapper, swap_result: Dict[str, Any], output_file: str) -> Dict[str, Any]:
+    """Run a swap, writing each phase to output_file as soon as it completes
+    
+    Phases are streamed into output_file + '.tmp' and fsynced on arrival, so a
+    swap that dies midway still leaves a log of the phases that finished. The
+    finished document is moved into place with an atomic rename, so readers of
+    output_file never see a partially written result.
+    """
+    keys = list(swap_result)
+    header = {key: swap_result[key] for key in keys[:keys.index('phases')]}
+    partial_file = output_file + '.tmp'
+    
+    with open(partial_file, 'wb') as f:
+        f.write(dump_json(header)[:-1] + b', "phases": [\n')
+        
+        async for phase in swapper.stream_swap(swap_result):
+            record = phase.to_dict()
+            if swap_result['phases']:
+                f.write(b',\n')
+            f.write(dump_json(record))
+            f.flush()
+            os.fsync(f.fileno())
+            swap_result['phases'].append(record)
+        
+        trailer = {key: value for key, value in swap_result.items() if key not in header and key != 'phases'}
+        f.write(b'\n], ' + dump_json(trailer)[1:] + b'\n')
+        f.flush()
+        os.fsync(f.fileno())
+    
+    os.replace(partial_file, output_file)
     
-    def _calculate_duration(self, start_time: str, end_time: str) -> float:
-        """Calculate total duration"""
-        start = datetime.fromisoformat(start_time)
-        end = datetime.fromisoformat(end_time)
-        return (end - start).total_seconds()
+    return swap_result
 
 def main():
     """Main entry point"""
@@ -324,23 +638,30 @@ def main():
     parser.add_argument('--to-version', required=True,
                        help='Target memory agent version')
     parser.add_argument('--swap-strategy', default='blue-green',
-                       choices=['blue-green', 'canary', 'rolling'],
+                       choices=SWAP_STRATEGIES,
                        help='Deployment strategy')
     parser.add_argument('--environment', required=True,
                        help='Target environment (production/staging/development)')
     parser.add_argument('--validation-time', type=int, default=120,
                        help='Post-swap validation time in seconds')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Random seed for a reproducible simulated swap')
     
     args = parser.parse_args()
     
+    # Line-buffer stdout so Actions logs stream without a flush per message
+    sys.stdout.reconfigure(line_buffering=True)
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(message)s',
+                        datefmt='%H:%M:%S', stream=sys.stdout)
+    
     try:
         log(f"Starting memory agent hot swap")
         log(f"From: {args.from_version} → To: {args.to_version}")
         log(f"Strategy: {args.swap_strategy}, Environment: {args.environment}")
         
         # Perform the swap
-        swapper = MemoryAgentSwapper()
-        result = swapper.perform_swap(
+        swapper = MemoryAgentSwapper(seed=args.seed)
+        swap_result = swapper.new_swap(
             args.from_version,
             args.to_version,
             args.swap_strategy,
@@ -348,60 +669,61 @@ def main():
             args.validation_time
         )
         
-        # Save results
-        with open('memory_swap_results.json', 'w') as f:
-            json.dump(result, f, indent=2)
+        # Results are saved phase by phase while the swap runs
+        result = asyncio.run(stream_swap_results(swapper, swap_result, 'memory_swap_results.json'))
         
         # Set GitHub Actions outputs using the new format
-        try:
-            set_github_output('swap_status', result['swap_status'])
-            set_github_output('final_version', result.get('final_version', 'unknown'))
-            set_github_output('swap_id', result['swap_id'])
-            set_github_output('total_duration', str(result.get('total_duration', 0)))
-        except Exception as e:
-            log(f"Warning: Error setting GitHub outputs: {e}")
+        set_github_outputs({
+            'swap_status': result['swap_status'],
+            'final_version': result.get('final_version', 'unknown'),
+            'swap_id': result['swap_id'],
+            'total_duration': result.get('total_duration', 0)
+        })
         
-        # Display results summary
-        print(f"\n🧠 Memory Agent Swap Results:")
-        print(f"Status: {result['swap_status']}")
-        print(f"Final Version: {result.get('final_version', 'unknown')}")
-        print(f"Total Duration: {result.get('total_duration', 0):.1f} seconds")
-        print(f"Phases Completed: {len(result['phases'])}")
+        # Display results summary, written to stdout in one go
+        lines = []
+        lines.append(f"\n🧠 Memory Agent Swap Results:")
+        lines.append(f"Status: {result['swap_status']}")
+        lines.append(f"Final Version: {result.get('final_version', 'unknown')}")
+        lines.append(f"Total Duration: {result.get('total_duration', 0):.1f} seconds")
+        lines.append(f"Phases Completed: {len(result['phases'])}")
         
         if result['swap_status'] == 'success':
-            print(f"✅ Memory agent successfully swapped to {args.to_version}")
+            lines.append(f"✅ Memory agent successfully swapped to {args.to_version}")
             # Show performance improvement if available
             for phase in result['phases']:
                 if phase.get('phase') == 'validation' and 'performance_improvement' in phase:
-                    print(f"📈 Performance improvement: {phase['performance_improvement']:.1f}%")
+                    lines.append(f"📈 Performance improvement: {phase['performance_improvement']:.1f}%")
         elif result['swap_status'] == 'rolled_back':
-            print(f"⚠️ Swap failed, rolled back to {args.from_version}")
+            lines.append(f"⚠️ Swap failed, rolled back to {args.from_version}")
         else:
-            print(f"❌ Swap failed: {result.get('error', 'Unknown error')}")
+            lines.append(f"❌ Swap failed: {result.get('error', 'Unknown error')}")
         
         # Show phase details
-        print(f"\n📋 Phase Details:")
+        lines.append(f"\n📋 Phase Details:")
         for i, phase in enumerate(result['phases'], 1):
             status_icon = "✅" if phase['status'] == 'success' else "❌"
             duration = phase.get('duration_ms', 0) / 1000
-            print(f"  {i}. {status_icon} {phase['phase'].replace('_', ' ').title()}: {phase.get('message', 'No details')} ({duration:.1f}s)")
+            lines.append(f"  {i}. {status_icon} {phase['phase'].replace('_', ' ').title()}: {phase.get('message', 'No details')} ({duration:.1f}s)")
         
         # Show additional details for successful swaps
         if result['swap_status'] == 'success':
-            print(f"\n🎯 Swap Summary:")
-            print(f"  • Strategy: {args.swap_strategy}")
-            print(f"  • Environment: {args.environment}")
-            print(f"  • Total Duration: {result.get('total_duration', 0):.1f}s")
-            print(f"  • Phases: {len(result['phases'])}")
+            lines.append(f"\n🎯 Swap Summary:")
+            lines.append(f"  • Strategy: {args.swap_strategy}")
+            lines.append(f"  • Environment: {args.environment}")
+            lines.append(f"  • Total Duration: {result.get('total_duration', 0):.1f}s")
+            lines.append(f"  • Phases: {len(result['phases'])}")
             
             # Find and show deployment details
             for phase in result['phases']:
                 if phase.get('phase') == 'deployment':
                     instances = phase.get('instances_deployed', 'unknown')
-                    print(f"  • Instances Deployed: {instances}")
+                    lines.append(f"  • Instances Deployed: {instances}")
                 elif phase.get('phase') == 'cleanup':
                     freed_mb = phase.get('storage_freed_mb', 0)
-                    print(f"  • Storage Freed: {freed_mb}MB")
+                    lines.append(f"  • Storage Freed: {freed_mb}MB")
+        
+        sys.stdout.write('\n'.join(lines) + '\n')
         
         log("Memory agent swap completed")
         return 0
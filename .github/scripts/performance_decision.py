@@ -4,210 +4,382 @@ Analyzes performance metrics and makes intelligent swap decisions
 Save as: .github/scripts/performance_decision.py
 """
 
+import glob
+import heapq
 import json
+import math
 import argparse
 import sys
 import os
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# Metrics files at least this large are streamed instead of parsed whole
+STREAMING_THRESHOLD_BYTES = 10 * 1024
+
+# Distinct (metrics, threshold, action) analyses each engine memoizes
+ANALYSIS_CACHE_SIZE = 128
 
 def log(message):
     """Simple logging function"""
     print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
 
-def set_github_output(name, value):
-    """Set GitHub Actions output using the new format"""
+def load_json(path: str) -> Any:
+    """Load a JSON file, using orjson when it is installed"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+def load_metrics(path: str) -> Any:
+    """
+    Load a metrics document. Large files are streamed with ijson one top-level
+    section at a time, keeping only the sections the decision engine reads.
+    """
+    if not HAS_IJSON or os.path.getsize(path) < STREAMING_THRESHOLD_BYTES:
+        return _intern_keys(load_json(path))
+    wanted = ('error',) + PerformanceDecisionEngine.COMPONENTS
+    with open(path, 'rb') as f:
+        return _intern_keys({key: value for key, value in ijson.kvitems(f, '', use_float=True) if key in wanted})
+
+def _intern_keys(metrics: Any) -> Any:
+    """
+    Intern section and metric names. Parsed JSON keys are fresh strings, while the
+    engine's keys are interned literals, so interned keys match by identity on lookup.
+    """
+    if not isinstance(metrics, dict):
+        return metrics
+    return {
+        sys.intern(key): {sys.intern(name): value for name, value in section.items()} if isinstance(section, dict) else section
+        for key, section in metrics.items()
+    }
+
+def dump_json(obj: Any, path: str, pretty: bool = False):
+    """Write obj to path as compact JSON (indented if pretty), using orjson when it is installed"""
+    if HAS_ORJSON:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2 if pretty else None, separators=None if pretty else (',', ':'))
+
+def set_github_outputs(outputs: Dict[str, Any]):
+    """Set GitHub Actions outputs using the new format, in a single write"""
+    lines = ''.join(f"{name}={value}\n" for name, value in outputs.items())
     try:
         if 'GITHUB_OUTPUT' in os.environ:
             with open(os.environ['GITHUB_OUTPUT'], 'a') as f:
-                f.write(f"{name}={value}\n")
+                f.write(lines)
         else:
             # Fallback for local testing
-            print(f"OUTPUT: {name}={value}")
+            sys.stdout.write(''.join(f"OUTPUT: {line}\n" for line in lines.splitlines()))
     except Exception as e:
-        print(f"Warning: Could not set output {name}: {e}")
+        print(f"Warning: Could not set outputs {', '.join(outputs)}: {e}")
+
+def _freeze_metrics(metrics: Dict[str, Any]) -> tuple:
+    """Hashable, key-order independent form of a metrics document"""
+    return tuple(sorted(
+        (key, tuple(sorted(value.items())) if isinstance(value, dict) else value)
+        for key, value in metrics.items()
+    ))
+
+def _thaw_metrics(frozen_metrics: tuple) -> Dict[str, Any]:
+    """Inverse of _freeze_metrics"""
+    return {key: dict(value) if isinstance(value, tuple) else value for key, value in frozen_metrics}
+
+# Relative weight of each metric in a component's performance score
+_METRIC_WEIGHTS = {
+    'cpu_usage': 0.25, 'memory_usage': 0.25, 'response_time_ms': 0.30,
+    'error_rate': 0.20, 'cache_hit_rate': 0.15, 'decision_accuracy': 0.25,
+    'message_throughput': 0.30, 'avg_latency_ms': 0.25, 'queue_depth': 0.20,
+    'message_loss_rate': 0.15
+}
+
+# Metrics where a lower value is better; all others score higher-is-better
+_LOWER_IS_BETTER = frozenset(('cpu_usage', 'memory_usage', 'response_time_ms', 'error_rate',
+                              'avg_latency_ms', 'queue_depth', 'message_loss_rate'))
+
+def _scoring_table(thresholds: Dict[str, float]) -> tuple:
+    """Flatten a component's thresholds into (metric, threshold, weight, lower_is_better) rows"""
+    return tuple(
+        (metric, threshold_val, _METRIC_WEIGHTS[metric], metric in _LOWER_IS_BETTER)
+        for metric, threshold_val in thresholds.items()
+        if metric in _METRIC_WEIGHTS
+    )
+
+def _weighted_score(metrics: Dict[str, Any], scoring_table: tuple) -> float:
+    """Weighted 0.0-1.0 score of metrics against a scoring table; metrics not reported are skipped"""
+    weighted_scores = []
+    weights = []
+    
+    for metric, threshold_val, weight, lower_is_better in scoring_table:
+        if metric in metrics:
+            ratio = metrics[metric] / threshold_val
+            metric_score = max(0.0, 1.0 - ratio) if lower_is_better else min(1.0, ratio)
+            weighted_scores.append(metric_score * weight)
+            weights.append(weight)
+    
+    weight_sum = math.fsum(weights)
+    return math.fsum(weighted_scores) / weight_sum if weight_sum > 0 else 1.0
+
+# Characteristic weights used to rank versions for each kind of optimization
+_OPTIMIZATION_WEIGHTS = {
+    'performance': (('performance', 0.6), ('stability', 0.4)),
+    'efficiency': (('efficiency', 0.6), ('stability', 0.4)),
+    'stability': (('stability', 0.8), ('performance', 0.2))
+}
+
+def _version_score(characteristics: Dict[str, float], optimization_type: str) -> float:
+    """Score a version's characteristics for the optimization needed"""
+    weights = _OPTIMIZATION_WEIGHTS.get(optimization_type)
+    if weights is None:
+        return sum(characteristics.values()) / len(characteristics)
+    return sum(characteristics.get(name, 0) * weight for name, weight in weights)
+
+def _version_heap(versions: Dict[str, Dict[str, float]], optimization_type: str) -> list:
+    """Max-heap of (-score, rank, version); rank keeps the first-listed version on ties"""
+    heap = []
+    for rank, (version, characteristics) in enumerate(versions.items()):
+        heapq.heappush(heap, (-_version_score(characteristics, optimization_type), rank, version))
+    return heap
+
+def _best_version(heap: list, exclude: str) -> Tuple[Optional[str], float]:
+    """Highest scoring (version, score) in a version heap other than exclude"""
+    if not heap:
+        return None, 0
+    # If the root is excluded the runner-up is one of its two children
+    candidates = heap[:1] if heap[0][2] != exclude else heap[1:3]
+    if not candidates:
+        return None, 0
+    neg_score, _, version = min(candidates)
+    return version, -neg_score
+
+class AnalysisResult:
+    """Outcome of one performance analysis"""
+    
+    __slots__ = ('timestamp', 'threshold', 'action', 'component_scores', 'swap_needed', 'recommendations',
+                 'target_agent', 'current_version', 'recommended_version', 'swap_reason',
+                 'performance_score', 'confidence', 'error')
+    
+    def __init__(self, timestamp: str, threshold: float, action: str, swap_reason: str = '',
+                 error: Optional[str] = None):
+        self.timestamp = timestamp
+        self.threshold = threshold
+        self.action = action
+        self.component_scores = {}
+        self.swap_needed = False
+        self.recommendations = []
+        self.target_agent = 'none'
+        self.current_version = ''
+        self.recommended_version = ''
+        self.swap_reason = swap_reason
+        self.performance_score = 0.5
+        self.confidence = 0.0
+        self.error = error
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict for JSON output; a failed analysis reports 'error' in place of 'recommendations'"""
+        # Copy the containers, the result itself may be cached and reused
+        analysis = {
+            'timestamp': self.timestamp,
+            'threshold': self.threshold,
+            'action': self.action,
+            'component_scores': dict(self.component_scores),
+            'swap_needed': self.swap_needed
+        }
+        if self.error is None:
+            analysis['recommendations'] = [dict(recommendation) for recommendation in self.recommendations]
+        analysis.update({
+            'target_agent': self.target_agent,
+            'current_version': self.current_version,
+            'recommended_version': self.recommended_version,
+            'swap_reason': self.swap_reason,
+            'performance_score': self.performance_score,
+            'confidence': self.confidence
+        })
+        if self.error is not None:
+            analysis['error'] = self.error
+        return analysis
 
 class PerformanceDecisionEngine:
     """Makes intelligent decisions about component swapping based on performance"""
     
-    def __init__(self):
-        # Performance thresholds for different components
-        self.thresholds = {
-            'memory_agent': {
-                'cpu_usage': 0.80,
-                'memory_usage': 0.85,
-                'response_time_ms': 500,
-                'error_rate': 0.05,
-                'cache_hit_rate': 0.75
-            },
-            'reasoning_agent': {
-                'cpu_usage': 0.75,
-                'memory_usage': 0.80,
-                'response_time_ms': 1000,
-                'error_rate': 0.03,
-                'decision_accuracy': 0.85
-            },
-            'communication_system': {
-                'message_throughput': 800,
-                'avg_latency_ms': 60,
-                'queue_depth': 50,
-                'message_loss_rate': 0.001
-            }
+    __slots__ = ('_analyze_cached',)
+    
+    # Components scored on every analysis, in reporting order
+    COMPONENTS = ('memory_agent', 'reasoning_agent', 'communication_system')
+    
+    # Short names used for version lookups and swap targets
+    _COMPONENT_SHORTNAME = {
+        'memory_agent': 'memory',
+        'reasoning_agent': 'reasoning',
+        'communication_system': 'communication'
+    }
+    
+    # Performance thresholds for different components
+    THRESHOLDS = {
+        'memory_agent': {
+            'cpu_usage': 0.80,
+            'memory_usage': 0.85,
+            'response_time_ms': 500,
+            'error_rate': 0.05,
+            'cache_hit_rate': 0.75
+        },
+        'reasoning_agent': {
+            'cpu_usage': 0.75,
+            'memory_usage': 0.80,
+            'response_time_ms': 1000,
+            'error_rate': 0.03,
+            'decision_accuracy': 0.85
+        },
+        'communication_system': {
+            'message_throughput': 800,
+            'avg_latency_ms': 60,
+            'queue_depth': 50,
+            'message_loss_rate': 0.001
         }
-        
-        # Available component versions and their characteristics
-        self.component_versions = {
-            'memory': {
-                'v1.0-standard': {'performance': 0.7, 'efficiency': 0.8, 'stability': 0.9},
-                'v1.1-performance': {'performance': 0.9, 'efficiency': 0.6, 'stability': 0.8},
-                'v1.2-efficient': {'performance': 0.6, 'efficiency': 0.9, 'stability': 0.95}
-            },
-            'reasoning': {
-                'v2.0-analytical': {'performance': 0.7, 'accuracy': 0.95, 'stability': 0.9},
-                'v2.1-fast': {'performance': 0.9, 'accuracy': 0.85, 'stability': 0.8},
-                'v1.9-reliable': {'performance': 0.6, 'accuracy': 0.97, 'stability': 0.98}
-            },
-            'communication': {
-                'v3.0-standard': {'performance': 0.7, 'throughput': 0.8, 'stability': 0.9},
-                'v3.1-highperf': {'performance': 0.9, 'throughput': 0.95, 'stability': 0.85}
-            }
+    }
+    
+    # Available component versions and their characteristics
+    COMPONENT_VERSIONS = {
+        'memory': {
+            'v1.0-standard': {'performance': 0.7, 'efficiency': 0.8, 'stability': 0.9},
+            'v1.1-performance': {'performance': 0.9, 'efficiency': 0.6, 'stability': 0.8},
+            'v1.2-efficient': {'performance': 0.6, 'efficiency': 0.9, 'stability': 0.95}
+        },
+        'reasoning': {
+            'v2.0-analytical': {'performance': 0.7, 'accuracy': 0.95, 'stability': 0.9},
+            'v2.1-fast': {'performance': 0.9, 'accuracy': 0.85, 'stability': 0.8},
+            'v1.9-reliable': {'performance': 0.6, 'accuracy': 0.97, 'stability': 0.98}
+        },
+        'communication': {
+            'v3.0-standard': {'performance': 0.7, 'throughput': 0.8, 'stability': 0.9},
+            'v3.1-highperf': {'performance': 0.9, 'throughput': 0.95, 'stability': 0.85}
         }
-        
+    }
+    
+    # Scoring rows per component, resolved once instead of on every score
+    _SCORING_TABLES = {component: _scoring_table(thresholds) for component, thresholds in THRESHOLDS.items()}
+    
+    # Versions ranked for each optimization type, built once per component
+    _VERSION_HEAPS = {
+        component: {optimization_type: _version_heap(versions, optimization_type) for optimization_type in _OPTIMIZATION_WEIGHTS}
+        for component, versions in COMPONENT_VERSIONS.items()
+    }
+    
+    def __init__(self):
+        # Per-engine memo, so cached analyses are freed with the engine
+        self._analyze_cached = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._analyze_frozen)
         log("Performance decision engine initialized")
     
-    def analyze_performance(self, metrics: Dict[str, Any], threshold: float, action: str) -> Dict[str, Any]:
-        """Main analysis function"""
+    def analyze_performance(self, metrics: Dict[str, Any], threshold: float, action: str,
+                            timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Main analysis function; identical metrics/threshold/action reuse the cached analysis.
+        Batch callers can pass one ISO timestamp for every analysis instead of reading the clock each time.
+        """
+        try:
+            frozen_metrics = _freeze_metrics(metrics)
+            hash(frozen_metrics)
+        except (TypeError, AttributeError):
+            # Not a flat metrics document, analyze it uncached
+            result = self._analyze(metrics, threshold, action)
+        else:
+            result = self._analyze_cached(frozen_metrics, threshold, action)
+        
+        analysis = result.to_dict()
+        analysis['timestamp'] = timestamp or datetime.now().isoformat()
+        return analysis
+    
+    def _analyze_frozen(self, frozen_metrics: tuple, threshold: float, action: str) -> AnalysisResult:
+        """Memoized analysis of a frozen metrics document"""
+        return self._analyze(_thaw_metrics(frozen_metrics), threshold, action)
+    
+    def _analyze(self, metrics: Dict[str, Any], threshold: float, action: str) -> AnalysisResult:
+        """Score every component and pick the most urgent swap recommendation; the timestamp is stamped by the caller"""
+        result = AnalysisResult(timestamp='', threshold=threshold, action=action)
         try:
             log(f"Analyzing performance with threshold={threshold}, action={action}")
             
-            analysis = {
-                'timestamp': datetime.now().isoformat(),
-                'threshold': threshold,
-                'action': action,
-                'component_scores': {},
-                'swap_needed': False,
-                'recommendations': []
-            }
-            
             # Check if metrics contain errors
             if 'error' in metrics:
                 log(f"Warning: Metrics contain error: {metrics['error']}")
-                analysis.update({
-                    'target_agent': 'none',
-                    'current_version': '',
-                    'recommended_version': '',
-                    'swap_reason': f"Metrics collection failed: {metrics['error']}",
-                    'performance_score': 0.5,
-                    'confidence': 0.0
-                })
-                return analysis
+                result.swap_reason = f"Metrics collection failed: {metrics['error']}"
+                return result
             
             # Calculate performance scores for each component
-            for component in ['memory_agent', 'reasoning_agent', 'communication_system']:
+            for component in self.COMPONENTS:
                 if component in metrics:
                     try:
                         score = self._calculate_performance_score(component, metrics[component])
-                        analysis['component_scores'][component] = score
+                        result.component_scores[component] = score
                         log(f"{component} performance score: {score:.3f}")
                         
                         # Check if swap is needed
                         if score < threshold:
-                            component_name = component.replace('_agent', '').replace('_system', '')
+                            component_name = self._COMPONENT_SHORTNAME[component]
                             recommendation = self._recommend_version(component_name, metrics[component], score)
                             
                             if recommendation:
-                                analysis['swap_needed'] = True
-                                analysis['recommendations'].append(recommendation)
+                                result.swap_needed = True
+                                result.recommendations.append(recommendation)
                                 log(f"Swap recommended for {component}: {recommendation['reason']}")
                                 
                     except Exception as e:
                         log(f"Error analyzing {component}: {e}")
-                        analysis['component_scores'][component] = 0.5
+                        result.component_scores[component] = 0.5
             
             # Select primary recommendation (most urgent)
-            if analysis['recommendations']:
-                # Sort by urgency (lowest score first)
-                analysis['recommendations'].sort(key=lambda x: x['current_score'])
-                primary_rec = analysis['recommendations'][0]
+            if result.recommendations:
+                # Most urgent is the lowest current score
+                primary_rec = min(result.recommendations, key=itemgetter('current_score'))
                 
-                analysis.update({
-                    'target_agent': primary_rec['component'],
-                    'current_version': primary_rec['current_version'],
-                    'recommended_version': primary_rec['recommended_version'],
-                    'swap_reason': primary_rec['reason'],
-                    'performance_score': primary_rec['current_score'],
-                    'confidence': primary_rec['confidence']
-                })
+                result.target_agent = primary_rec['component']
+                result.current_version = primary_rec['current_version']
+                result.recommended_version = primary_rec['recommended_version']
+                result.swap_reason = primary_rec['reason']
+                result.performance_score = primary_rec['current_score']
+                result.confidence = primary_rec['confidence']
             else:
                 # No swap needed
-                best_score = max(analysis['component_scores'].values()) if analysis['component_scores'] else 1.0
-                analysis.update({
-                    'target_agent': 'none',
-                    'current_version': '',
-                    'recommended_version': '',
-                    'swap_reason': 'All components performing within thresholds',
-                    'performance_score': best_score,
-                    'confidence': 0.0
-                })
+                result.swap_reason = 'All components performing within thresholds'
+                result.performance_score = max(result.component_scores.values(), default=1.0)
             
-            log(f"Analysis complete: swap_needed={analysis['swap_needed']}")
-            return analysis
+            log(f"Analysis complete: swap_needed={result.swap_needed}")
+            return result
             
         except Exception as e:
             log(f"Critical error in performance analysis: {e}")
-            return {
-                'timestamp': datetime.now().isoformat(),
-                'threshold': threshold,
-                'action': action,
-                'component_scores': {},
-                'swap_needed': False,
-                'target_agent': 'none',
-                'current_version': '',
-                'recommended_version': '',
-                'swap_reason': f'Analysis failed: {str(e)}',
-                'performance_score': 0.5,
-                'confidence': 0.0,
-                'error': str(e)
-            }
+            return AnalysisResult(
+                timestamp='',
+                threshold=threshold,
+                action=action,
+                swap_reason=f'Analysis failed: {str(e)}',
+                error=str(e)
+            )
     
     def _calculate_performance_score(self, component: str, metrics: Dict[str, Any]) -> float:
         """Calculate performance score for a component (0.0 = bad, 1.0 = perfect)"""
         try:
-            thresholds = self.thresholds.get(component, {})
-            if not thresholds:
+            scoring_table = self._SCORING_TABLES.get(component)
+            if not scoring_table:
                 log(f"Warning: No thresholds defined for {component}")
                 return 1.0
             
-            score = 0.0
-            weight_sum = 0.0
-            
-            # Define metric weights
-            metric_weights = {
-                'cpu_usage': 0.25, 'memory_usage': 0.25, 'response_time_ms': 0.30,
-                'error_rate': 0.20, 'cache_hit_rate': 0.15, 'decision_accuracy': 0.25,
-                'message_throughput': 0.30, 'avg_latency_ms': 0.25, 'queue_depth': 0.20,
-                'message_loss_rate': 0.15
-            }
-            
-            for metric, threshold_val in thresholds.items():
-                if metric in metrics and metric in metric_weights:
-                    current_val = metrics[metric]
-                    weight = metric_weights[metric]
-                    weight_sum += weight
-                    
-                    # Calculate metric score (different logic for different metric types)
-                    if metric in ['cpu_usage', 'memory_usage', 'response_time_ms', 'error_rate', 
-                                 'avg_latency_ms', 'queue_depth', 'message_loss_rate']:
-                        # Lower is better metrics
-                        metric_score = max(0, 1 - (current_val / threshold_val))
-                    else:
-                        # Higher is better metrics (cache_hit_rate, decision_accuracy, message_throughput)
-                        metric_score = min(1, current_val / threshold_val)
-                    
-                    score += metric_score * weight
-            
-            final_score = score / weight_sum if weight_sum > 0 else 1.0
-            return final_score
+            return _weighted_score(metrics, scoring_table)
             
         except Exception as e:
             log(f"Error calculating score for {component}: {e}")
@@ -216,11 +388,11 @@ class PerformanceDecisionEngine:
     def _recommend_version(self, component: str, metrics: Dict[str, Any], current_score: float) -> Optional[Dict[str, Any]]:
         """Recommend the best version for current conditions"""
         try:
-            if component not in self.component_versions:
+            if component not in self.COMPONENT_VERSIONS:
                 log(f"Warning: No versions available for {component}")
                 return None
             
-            versions = self.component_versions[component]
+            versions = self.COMPONENT_VERSIONS[component]
             
             # Mock current version (in real system, this would come from deployment info)
             current_version = "v1.0-standard"  # Default current version
@@ -228,29 +400,13 @@ class PerformanceDecisionEngine:
             # Determine what kind of optimization is needed
             optimization_needed = self._determine_optimization_type(component, metrics)
             
-            # Score each version based on what we need
-            best_version = None
-            best_score = 0
-            
-            for version, characteristics in versions.items():
-                if version == current_version:
-                    continue
-                
-                # Score version based on optimization needs
-                if optimization_needed == 'performance':
-                    version_score = characteristics.get('performance', 0) * 0.6 + characteristics.get('stability', 0) * 0.4
-                elif optimization_needed == 'efficiency':
-                    version_score = characteristics.get('efficiency', 0) * 0.6 + characteristics.get('stability', 0) * 0.4
-                elif optimization_needed == 'stability':
-                    version_score = characteristics.get('stability', 0) * 0.8 + characteristics.get('performance', 0) * 0.2
-                else:
-                    version_score = sum(characteristics.values()) / len(characteristics)
-                
-                if version_score > best_score:
-                    best_score = version_score
-                    best_version = version
+            # Versions are pre-ranked per optimization type; the best one is at the top of its heap
+            version_heap = self._VERSION_HEAPS[component].get(optimization_needed)
+            if version_heap is None:
+                version_heap = _version_heap(versions, optimization_needed)
+            best_version, best_score = _best_version(version_heap, current_version)
             
-            if best_version:
+            if best_version and best_score > 0:
                 return {
                     'component': component,
                     'current_version': current_version,
@@ -270,32 +426,11 @@ class PerformanceDecisionEngine:
     def _determine_optimization_type(self, component: str, metrics: Dict[str, Any]) -> str:
         """Determine what type of optimization is needed"""
         try:
-            thresholds = self.thresholds.get(component, {})
-            
-            performance_issues = 0
-            efficiency_issues = 0
-            
-            if component == 'memory_agent':
-                if metrics.get('response_time_ms', 0) > thresholds.get('response_time_ms', 500) * 0.8:
-                    performance_issues += 1
-                if metrics.get('cpu_usage', 0) > 0.7:
-                    efficiency_issues += 1
-                if metrics.get('memory_usage', 0) > 0.7:
-                    efficiency_issues += 1
-            
-            elif component == 'reasoning_agent':
-                if metrics.get('response_time_ms', 0) > thresholds.get('response_time_ms', 1000) * 0.8:
-                    performance_issues += 1
-                if metrics.get('decision_accuracy', 1) < 0.9:
-                    performance_issues += 1
-                if metrics.get('cpu_usage', 0) > 0.7:
-                    efficiency_issues += 1
+            count_issues = _ISSUE_COUNTERS.get(component)
+            if count_issues is None:
+                return 'stability'
             
-            elif component == 'communication_system':
-                if metrics.get('message_throughput', 1000) < thresholds.get('message_throughput', 800):
-                    performance_issues += 1
-                if metrics.get('avg_latency_ms', 0) > thresholds.get('avg_latency_ms', 60) * 0.8:
-                    performance_issues += 1
+            performance_issues, efficiency_issues = count_issues(metrics)
             
             if performance_issues > efficiency_issues:
                 return 'performance'
@@ -308,11 +443,77 @@ class PerformanceDecisionEngine:
             log(f"Error determining optimization type: {e}")
             return 'performance'
 
+def _memory_issues(metrics: Dict[str, Any]) -> Tuple[int, int]:
+    """(performance_issues, efficiency_issues) for the memory agent"""
+    response_time = metrics.get('response_time_ms', 0)
+    cpu_usage = metrics.get('cpu_usage', 0)
+    memory_usage = metrics.get('memory_usage', 0)
+    thresholds = PerformanceDecisionEngine.THRESHOLDS['memory_agent']
+    performance_issues = int(response_time > thresholds['response_time_ms'] * 0.8)
+    efficiency_issues = int(cpu_usage > 0.7) + int(memory_usage > 0.7)
+    return performance_issues, efficiency_issues
+
+def _reasoning_issues(metrics: Dict[str, Any]) -> Tuple[int, int]:
+    """(performance_issues, efficiency_issues) for the reasoning agent"""
+    response_time = metrics.get('response_time_ms', 0)
+    accuracy = metrics.get('decision_accuracy', 1)
+    cpu_usage = metrics.get('cpu_usage', 0)
+    thresholds = PerformanceDecisionEngine.THRESHOLDS['reasoning_agent']
+    performance_issues = int(response_time > thresholds['response_time_ms'] * 0.8) + int(accuracy < 0.9)
+    efficiency_issues = int(cpu_usage > 0.7)
+    return performance_issues, efficiency_issues
+
+def _communication_issues(metrics: Dict[str, Any]) -> Tuple[int, int]:
+    """(performance_issues, efficiency_issues) for the communication system"""
+    throughput = metrics.get('message_throughput', 1000)
+    latency = metrics.get('avg_latency_ms', 0)
+    thresholds = PerformanceDecisionEngine.THRESHOLDS['communication_system']
+    performance_issues = int(throughput < thresholds['message_throughput']) + int(latency > thresholds['avg_latency_ms'] * 0.8)
+    return performance_issues, 0
+
+# Issue counters keyed by the full component names
+_ISSUE_COUNTERS = {
+    'memory_agent': _memory_issues,
+    'reasoning_agent': _reasoning_issues,
+    'communication_system': _communication_issues
+}
+
+def analyze_batch(pattern: str, output_dir: str, threshold: float, action: str, pretty: bool = False) -> int:
+    """Analyze every metrics file matching pattern with one engine, writing <name>_analysis.json per file"""
+    engine = PerformanceDecisionEngine()
+    timestamp = datetime.now().isoformat()
+    os.makedirs(output_dir, exist_ok=True)
+    
+    analyzed = failed = 0
+    for metrics_file in sorted(glob.iglob(pattern)):
+        try:
+            analysis = engine.analyze_performance(load_metrics(metrics_file), threshold, action, timestamp)
+            name = os.path.splitext(os.path.basename(metrics_file))[0]
+            dump_json(analysis, os.path.join(output_dir, f"{name}_analysis.json"), pretty)
+            analyzed += 1
+            print(f"{'⚠️' if analysis['swap_needed'] else '✅'} {metrics_file}: "
+                  f"score={analysis['performance_score']:.3f} target={analysis['target_agent']}")
+        except Exception as e:
+            failed += 1
+            log(f"Error analyzing {metrics_file}: {e}")
+    
+    if not analyzed and not failed:
+        log(f"No metrics files match '{pattern}'")
+        return 1
+    
+    log(f"Analyzed {analyzed} metrics files into {output_dir} ({failed} failed)")
+    return 1 if failed else 0
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='Analyze performance and make swap decisions')
-    parser.add_argument('--metrics-file', required=True,
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--metrics-file',
                        help='Path to metrics JSON file')
+    source.add_argument('--metrics-glob',
+                       help='Glob of metrics JSON files to analyze in one process')
+    parser.add_argument('--output-dir', default='.',
+                       help='Directory for per-file analyses in --metrics-glob mode')
     parser.add_argument('--threshold', type=float, default=0.7,
                        help='Performance threshold (0.0-1.0)')
     parser.add_argument('--action', default='monitor_and_swap',
@@ -320,9 +521,14 @@ def main():
                        help='Action to perform')
     parser.add_argument('--webhook-data', default='{}',
                        help='Webhook data JSON string')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Write indented, human-readable analysis JSON')
     
     args = parser.parse_args()
     
+    if args.metrics_glob:
+        return analyze_batch(args.metrics_glob, args.output_dir, args.threshold, args.action, args.verbose)
+    
     try:
         log(f"Starting performance analysis with file: {args.metrics_file}")
         
@@ -330,8 +536,7 @@ def main():
         if not os.path.exists(args.metrics_file):
             raise FileNotFoundError(f"Metrics file '{args.metrics_file}' not found")
         
-        with open(args.metrics_file, 'r') as f:
-            metrics = json.load(f)
+        metrics = load_metrics(args.metrics_file)
         
         # Parse webhook data
         try:
@@ -347,17 +552,18 @@ def main():
         analysis = engine.analyze_performance(metrics, args.threshold, args.action)
         
         # Save analysis results
-        with open('decision_analysis.json', 'w') as f:
-            json.dump(analysis, f, indent=2)
+        dump_json(analysis, 'decision_analysis.json', args.verbose)
         
         # Set GitHub Actions outputs using the new format
         try:
-            set_github_output('swap_needed', str(analysis['swap_needed']).lower())
-            set_github_output('target_agent', analysis['target_agent'])
-            set_github_output('current_version', analysis['current_version'])
-            set_github_output('recommended_version', analysis['recommended_version'])
-            set_github_output('swap_reason', analysis['swap_reason'])
-            set_github_output('performance_score', str(analysis['performance_score']))
+            set_github_outputs({
+                'swap_needed': str(analysis['swap_needed']).lower(),
+                'target_agent': analysis['target_agent'],
+                'current_version': analysis['current_version'],
+                'recommended_version': analysis['recommended_version'],
+                'swap_reason': analysis['swap_reason'],
+                'performance_score': analysis['performance_score']
+            })
         except Exception as e:
             log(f"Warning: Error setting GitHub outputs: {e}")
         
@@ -7,143 +7,274 @@ Save as: .github/scripts/simulate_metrics.py
 """
 
 import json
+import logging
 import random
 import argparse
 import sys
 import os
-from datetime import datetime
-from typing import Dict, Any, Optional # Added Dict here
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping, Sequence, Tuple # Added Dict here
 
-def log(message):
-    """Simple logging function"""
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+INF = float('inf')
+
+def _freeze(table: Dict[str, Any]) -> MappingProxyType:
+    """Read-only view of a nested table"""
+    return MappingProxyType({key: _freeze(value) if isinstance(value, dict) else value
+                             for key, value in table.items()})
+
+# Baseline performance metrics per environment and agent.
+# memory_agent production response_time_ms adjusted from 350 to a more typical, but not extremely low, baseline.
+BASE_PERFORMANCE = _freeze({
+    'production': {
+        'memory_agent': {
+            'cpu_usage': 0.65, 'memory_usage': 0.70, 'response_time_ms': 250,
+            'cache_hit_rate': 0.85, 'error_rate': 0.02, 'throughput': 450
+        },
+        'reasoning_agent': {
+            'cpu_usage': 0.70, 'memory_usage': 0.60, 'response_time_ms': 800,
+            'decision_accuracy': 0.92, 'error_rate': 0.01, 'throughput': 200
+        },
+        'communication_system': {
+            'cpu_usage': 0.40, 'memory_usage': 0.50, 'throughput': 900,
+            'latency_ms': 15, 'message_loss_rate': 0.0001, 'queue_depth': 30
+        }
+    },
+    'staging': {
+        'memory_agent': {
+            'cpu_usage': 0.55, 'memory_usage': 0.60, 'response_time_ms': 300,
+            'cache_hit_rate': 0.80, 'error_rate': 0.03, 'throughput': 380
+        },
+        'reasoning_agent': {
+            'cpu_usage': 0.60, 'memory_usage': 0.50, 'response_time_ms': 900,
+            'decision_accuracy': 0.90, 'error_rate': 0.015, 'throughput': 180
+        },
+        'communication_system': {
+            'cpu_usage': 0.35, 'memory_usage': 0.45, 'throughput': 750,
+            'latency_ms': 20, 'message_loss_rate': 0.0002, 'queue_depth': 40
+        }
+    },
+    'development': {
+        'memory_agent': {
+            'cpu_usage': 0.45, 'memory_usage': 0.50, 'response_time_ms': 400,
+            'cache_hit_rate': 0.70, 'error_rate': 0.05, 'throughput': 300
+        },
+        'reasoning_agent': {
+            'cpu_usage': 0.50, 'memory_usage': 0.40, 'response_time_ms': 1200,
+            'decision_accuracy': 0.85, 'error_rate': 0.03, 'throughput': 150
+        },
+        'communication_system': {
+            'cpu_usage': 0.30, 'memory_usage': 0.40, 'throughput': 600,
+            'latency_ms': 30, 'message_loss_rate': 0.0005, 'queue_depth': 50
+        }
+    }
+})
+
+# Agent key for each single --agent-type
+AGENT_KEYS = MappingProxyType({
+    'memory': 'memory_agent',
+    'reasoning': 'reasoning_agent',
+    'communication': 'communication_system',
+})
+
+# Metric kind for each simulated metric; unknown metrics vary as 'other'
+METRIC_KINDS = MappingProxyType({
+    'cpu_usage': 'resource', 'memory_usage': 'resource',
+    'response_time_ms': 'latency', 'latency_ms': 'latency',
+    'error_rate': 'errors', 'message_loss_rate': 'errors',
+    'throughput': 'throughput',
+    'cache_hit_rate': 'quality', 'decision_accuracy': 'quality',
+})
+
+def _agent_layout(metrics: Mapping[str, float]) -> Tuple[Tuple[str, ...], Tuple[float, ...], Tuple[str, ...]]:
+    """Column layout (metric names, baseline values, metric kinds) of one agent's baseline"""
+    keys = tuple(metrics)
+    return keys, tuple(metrics[key] for key in keys), tuple(METRIC_KINDS.get(key, 'other') for key in keys)
+
+# Column layout of every environment/agent baseline, built once at import
+AGENT_LAYOUTS = MappingProxyType({
+    environment: MappingProxyType({agent: _agent_layout(metrics) for agent, metrics in agents.items()})
+    for environment, agents in BASE_PERFORMANCE.items()
+})
+EMPTY_LAYOUT = ((), (), ())
+
+# (low, high, cap) multiplier applied to each metric kind under a load condition
+LOAD_VARIATIONS = _freeze({
+    # Higher resource usage, longer response times, potentially more errors
+    'high': {
+        'resource': (1.1, 1.3, 0.95), 'latency': (1.2, 1.5, INF), 'errors': (1.5, 2.0, 0.1),
+        'throughput': (0.7, 0.9, INF), 'quality': (0.9, 1.1, INF), 'other': (0.9, 1.1, INF),
+    },
+    # Lower resource usage, faster response times, fewer errors
+    'low': {
+        'resource': (0.7, 0.9, INF), 'latency': (0.6, 0.9, INF), 'errors': (0.3, 0.7, INF),
+        'throughput': (1.1, 1.3, INF), 'quality': (0.9, 1.1, INF), 'other': (0.9, 1.1, INF),
+    },
+    'normal': dict.fromkeys(('resource', 'latency', 'errors', 'throughput', 'quality', 'other'), (0.95, 1.05, INF)),
+})
+
+# Post-swap, assume some improvements or settling period
+SWAP_VARIATIONS = MappingProxyType({
+    'latency': (0.7, 0.9, INF),      # 10-30% improvement
+    'errors': (0.5, 0.8, INF),       # 20-50% reduction
+    'throughput': (1.1, 1.3, INF),   # 10-30% increase
+    'quality': (1.05, 1.15, 0.99),   # 5-15% increase, max 0.99
+    'resource': (0.9, 1.1, INF),     # may stabilize or slightly increase/decrease
+})
+
+class SimulationPlan:
+    """The parts of a simulation that do not depend on the random draw (cached and shared, so read-only)"""
+    
+    __slots__ = ('columns', 'spans', 'lows', 'highs', 'load_caps', 'swap_index', 'swap_caps')
+    
+    def __init__(self, columns: Tuple[Tuple[str, str], ...], spans: Tuple[Tuple[str, Tuple[str, ...], int, int], ...],
+                 lows: Sequence[float], highs: Sequence[float], load_caps: Sequence[float],
+                 swap_index: Sequence[int], swap_caps: Sequence[float]):
+        self.columns = columns        # (agent, metric) per output column
+        self.spans = spans            # (agent, metrics, start, stop) per agent
+        self.lows = lows              # load-scaled value bounds, then post-swap multiplier bounds
+        self.highs = highs
+        self.load_caps = load_caps
+        self.swap_index = swap_index  # columns a recent swap affects
+        self.swap_caps = swap_caps
+
+@lru_cache(maxsize=None)
+def simulation_plan(environment: str, agents: Tuple[str, ...], load_condition: str,
+                    include_recent_swaps: bool) -> SimulationPlan:
+    """
+    Partially evaluate a simulation. A baseline value v scaled by a multiplier drawn
+    from [low, high) is a draw from [v * low, v * high), so the load step is folded
+    into the draw bounds and only the post-swap step multiplies at run time.
+    """
+    env_layouts = AGENT_LAYOUTS[environment]
+    variations = LOAD_VARIATIONS.get(load_condition, LOAD_VARIATIONS['normal'])
+    
+    # Concatenate the selected agents' precomputed columns
+    layouts = [(agent, env_layouts.get(agent, EMPTY_LAYOUT)) for agent in agents]
+    columns = tuple((agent, key) for agent, (keys, _, _) in layouts for key in keys)
+    base_values = [value for _, (_, values, _) in layouts for value in values]
+    kinds = [kind for _, (_, _, agent_kinds) in layouts for kind in agent_kinds]
+    spans, start = [], 0
+    for agent, (keys, _, _) in layouts:
+        spans.append((agent, keys, start, start + len(keys)))
+        start += len(keys)
+    
+    load_ranges = [variations[kind] for kind in kinds]
+    # Only metric kinds with a post-swap variation are drawn and rescaled
+    swap_index = [i for i, kind in enumerate(kinds) if kind in SWAP_VARIATIONS] if include_recent_swaps else []
+    swap_ranges = [SWAP_VARIATIONS[kinds[i]] for i in swap_index]
+    lows = [value * low for value, (low, _, _) in zip(base_values, load_ranges)] + [low for low, _, _ in swap_ranges]
+    highs = [value * high for value, (_, high, _) in zip(base_values, load_ranges)] + [high for _, high, _ in swap_ranges]
+    load_caps = [cap for _, _, cap in load_ranges]
+    swap_caps = [cap for _, _, cap in swap_ranges]
+    
+    if HAS_NUMPY:
+        lows, highs, load_caps, swap_caps = (np.array(column) for column in (lows, highs, load_caps, swap_caps))
+        swap_index = np.array(swap_index, dtype=np.intp)
+    return SimulationPlan(columns, tuple(spans), lows, highs, load_caps, swap_index, swap_caps)
+
+logger = logging.getLogger(__name__)
+log = logger.info
+
+def dump_json(obj: Any, path: str, pretty: bool = False):
+    """
+    Write obj to path as compact JSON (indented if pretty), using orjson when it is installed.
+    The payload is encoded up front and handed to os.write, bypassing the buffered file layers.
+    """
+    if HAS_ORJSON:
+        payload = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+    else:
+        payload = json.dumps(obj, indent=2 if pretty else None, separators=None if pretty else (',', ':')).encode()
+    
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        remaining = memoryview(payload)
+        while remaining:
+            remaining = remaining[os.write(fd, remaining):]
+    finally:
+        os.close(fd)
 
 class PerformanceSimulator:
     """Simulate realistic performance metrics"""
     
-    def __init__(self, environment: str, agent_type: str):
+    def __init__(self, environment: str, agent_type: str, seed: Optional[int] = None):
         self.environment = environment
         self.agent_type = agent_type
-        self.base_performance = self._get_base_performance()
+        self.base_performance = BASE_PERFORMANCE
+        self._rng = np.random.default_rng(seed) if HAS_NUMPY else random.Random(seed)
+        # Resolve the simulated agents once; only 'all' depends on the environment
+        if agent_type == 'all':
+            self.agents = tuple(BASE_PERFORMANCE.get(environment, {}))
+        else:
+            self.agents = (AGENT_KEYS.get(agent_type, f'{agent_type}_agent'),)
         log(f"Initializing simulator for {environment}/{agent_type}")
         
-    def _get_base_performance(self) -> Dict[str, Dict[str, float]]:
-        """
-        Get baseline performance metrics for different environments.
-        Adjusted response_time_ms for memory_agent to be more realistic.
-        """
-        return {
-            'production': {
-                'memory_agent': {
-                    'cpu_usage': 0.65, 'memory_usage': 0.70, 'response_time_ms': 250, # Adjusted from 350 to a more typical, but not extremely low, baseline
-                    'cache_hit_rate': 0.85, 'error_rate': 0.02, 'throughput': 450
-                },
-                'reasoning_agent': {
-                    'cpu_usage': 0.70, 'memory_usage': 0.60, 'response_time_ms': 800,
-                    'decision_accuracy': 0.92, 'error_rate': 0.01, 'throughput': 200
-                },
-                'communication_system': {
-                    'cpu_usage': 0.40, 'memory_usage': 0.50, 'throughput': 900,
-                    'latency_ms': 15, 'message_loss_rate': 0.0001, 'queue_depth': 30
-                }
-            },
-            'staging': {
-                'memory_agent': {
-                    'cpu_usage': 0.55, 'memory_usage': 0.60, 'response_time_ms': 300,
-                    'cache_hit_rate': 0.80, 'error_rate': 0.03, 'throughput': 380
-                },
-                'reasoning_agent': {
-                    'cpu_usage': 0.60, 'memory_usage': 0.50, 'response_time_ms': 900,
-                    'decision_accuracy': 0.90, 'error_rate': 0.015, 'throughput': 180
-                },
-                'communication_system': {
-                    'cpu_usage': 0.35, 'memory_usage': 0.45, 'throughput': 750,
-                    'latency_ms': 20, 'message_loss_rate': 0.0002, 'queue_depth': 40
-                }
-            },
-            'development': {
-                'memory_agent': {
-                    'cpu_usage': 0.45, 'memory_usage': 0.50, 'response_time_ms': 400,
-                    'cache_hit_rate': 0.70, 'error_rate': 0.05, 'throughput': 300
-                },
-                'reasoning_agent': {
-                    'cpu_usage': 0.50, 'memory_usage': 0.40, 'response_time_ms': 1200,
-                    'decision_accuracy': 0.85, 'error_rate': 0.03, 'throughput': 150
-                },
-                'communication_system': {
-                    'cpu_usage': 0.30, 'memory_usage': 0.40, 'throughput': 600,
-                    'latency_ms': 30, 'message_loss_rate': 0.0005, 'queue_depth': 50
-                }
-            }
-        }
-
+    def _uniforms(self, lows: Sequence[float], highs: Sequence[float], count: int):
+        """count rows of uniform draws, column i in [lows[i], highs[i])"""
+        if HAS_NUMPY:
+            return self._rng.uniform(lows, highs, size=(count, len(lows)))
+        return [[self._rng.uniform(low, high) for low, high in zip(lows, highs)] for _ in range(count)]
+    
+    @staticmethod
+    def _apply_swaps(values, swap_factors, plan: SimulationPlan):
+        """Rescale the swap-affected columns of values in place by their post-swap multipliers"""
+        if HAS_NUMPY:
+            index = plan.swap_index
+            values[:, index] = np.clip(values[:, index] * swap_factors, 0.0, plan.swap_caps)
+            return values
+        for row, factor_row in zip(values, swap_factors):
+            for i, factor, cap in zip(plan.swap_index, factor_row, plan.swap_caps):
+                row[i] = min(row[i] * factor, cap)
+        return values
+    
+    def simulate_snapshots(self, count: int, load_condition: str = 'normal',
+                           include_recent_swaps: bool = False) -> List[Dict[str, Dict[str, float]]]:
+        """Generate count independent metric snapshots, drawing every multiplier in one batch"""
+        agents_to_simulate = self.agents
+        plan = simulation_plan(self.environment, agents_to_simulate, load_condition, include_recent_swaps)
+        if not plan.columns:
+            return [{agent: {} for agent in agents_to_simulate} for _ in range(count)]
+        
+        # One draw yields the load-scaled values directly and, when requested, the post-swap multipliers
+        draws = self._uniforms(plan.lows, plan.highs, count)
+        width = len(plan.columns)
+        if HAS_NUMPY:
+            values, swap_factors = draws[:, :width], draws[:, width:]
+            np.clip(values, 0.0, plan.load_caps, out=values)
+        else:
+            values = [[min(value, cap) for value, cap in zip(row[:width], plan.load_caps)] for row in draws]
+            swap_factors = [row[width:] for row in draws]
+        
+        # Simulate impact of recent swaps (if applicable)
+        if include_recent_swaps:
+            values = self._apply_swaps(values, swap_factors, plan)
+        
+        if HAS_NUMPY:
+            rows = np.round(values, 4).tolist()
+        else:
+            rows = [[round(value, 4) for value in row] for row in values]
+        
+        return [{agent: dict(zip(keys, row[start:stop])) for agent, keys, start, stop in plan.spans}
+                for row in rows]
+    
     def simulate_metrics(self, load_condition: str = 'normal', include_recent_swaps: bool = False):
         """Generate realistic performance metrics"""
         try:
             log(f"Simulating metrics: load={load_condition}, recent_swaps={include_recent_swaps}")
-            
-            metrics = {}
-            if self.agent_type == 'all':
-                agents_to_simulate = list(self.base_performance[self.environment].keys())
-            else:
-                agent_key = f'{self.agent_type}_agent' if self.agent_type != 'communication' else 'communication_system'
-                agents_to_simulate = [agent_key]
-                
-            for agent in agents_to_simulate:
-                base_values = self.base_performance[self.environment].get(agent, {})
-                current_metrics = {}
-
-                # Apply load condition variations
-                if load_condition == 'high':
-                    # Higher resource usage, longer response times, potentially more errors
-                    for key, value in base_values.items():
-                        if 'cpu_usage' in key or 'memory_usage' in key:
-                            current_metrics[key] = min(value * random.uniform(1.1, 1.3), 0.95)
-                        elif 'response_time_ms' in key or 'latency_ms' in key:
-                            current_metrics[key] = value * random.uniform(1.2, 1.5)
-                        elif 'error_rate' in key or 'message_loss_rate' in key:
-                            current_metrics[key] = min(value * random.uniform(1.5, 2.0), 0.1)
-                        elif 'throughput' in key:
-                            current_metrics[key] = value * random.uniform(0.7, 0.9)
-                        else:
-                            current_metrics[key] = value * random.uniform(0.9, 1.1)
-                elif load_condition == 'low':
-                    # Lower resource usage, faster response times, fewer errors
-                    for key, value in base_values.items():
-                        if 'cpu_usage' in key or 'memory_usage' in key:
-                            current_metrics[key] = value * random.uniform(0.7, 0.9)
-                        elif 'response_time_ms' in key or 'latency_ms' in key:
-                            current_metrics[key] = value * random.uniform(0.6, 0.9)
-                        elif 'error_rate' in key or 'message_loss_rate' in key:
-                            current_metrics[key] = value * random.uniform(0.3, 0.7)
-                        elif 'throughput' in key:
-                            current_metrics[key] = value * random.uniform(1.1, 1.3)
-                        else:
-                            current_metrics[key] = value * random.uniform(0.9, 1.1)
-                else: # 'normal' load
-                    for key, value in base_values.items():
-                        current_metrics[key] = value * random.uniform(0.95, 1.05)
-                
-                # Simulate impact of recent swaps (if applicable)
-                if include_recent_swaps:
-                    # Post-swap, assume some improvements or settling period
-                    for key in current_metrics:
-                        if 'response_time_ms' in key or 'latency_ms' in key:
-                            current_metrics[key] *= random.uniform(0.7, 0.9) # 10-30% improvement
-                        elif 'error_rate' in key or 'message_loss_rate' in key:
-                            current_metrics[key] *= random.uniform(0.5, 0.8) # 20-50% reduction
-                        elif 'throughput' in key:
-                            current_metrics[key] *= random.uniform(1.1, 1.3) # 10-30% increase
-                        elif 'cache_hit_rate' in key or 'accuracy' in key:
-                            current_metrics[key] = min(current_metrics[key] * random.uniform(1.05, 1.15), 0.99) # 5-15% increase, max 0.99
-                        # For CPU/Memory, assume it might stabilize or slightly increase/decrease
-                        elif 'cpu_usage' in key or 'memory_usage' in key:
-                            current_metrics[key] *= random.uniform(0.9, 1.1)
-
-
-                metrics[agent] = {k: round(v, 4) for k, v in current_metrics.items()}
-            
-            return metrics
+            return self.simulate_snapshots(1, load_condition, include_recent_swaps)[0]
             
         except Exception as e:
             log(f"Error simulating metrics: {e}")
@@ -151,17 +282,24 @@ class PerformanceSimulator:
 
 def main():
     parser = argparse.ArgumentParser(description="Simulate performance metrics.")
-    parser.add_argument('--environment', default='production', help='Target environment (e.g., production, staging)')
-    parser.add_argument('--agent-type', default='all', help='Type of agent (memory, reasoning, communication, all)')
+    parser.add_argument('--environment', default='production', choices=list(BASE_PERFORMANCE),
+                        help='Target environment (e.g., production, staging)')
+    parser.add_argument('--agent-type', default='all', choices=[*AGENT_KEYS, 'all'],
+                        help='Type of agent (memory, reasoning, communication, all)')
     parser.add_argument('--output-file', default='current_metrics.json', help='File to save metrics')
     parser.add_argument('--simulate-load', default='normal', choices=['normal', 'high', 'low'], help='Simulate different load conditions')
     parser.add_argument('--include-recent-swaps', action='store_true', help='Simulate impact of recent swaps')
+    parser.add_argument('--seed', type=int, default=os.environ.get('SIMULATION_SEED'),
+                        help='Random seed for reproducible metrics (default: $SIMULATION_SEED)')
+    parser.add_argument('--verbose', action='store_true', help='Write indented, human-readable metrics JSON')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(message)s',
+                        datefmt='%H:%M:%S', stream=sys.stdout)
     
     try:
         # Generate metrics
-        simulator = PerformanceSimulator(args.environment, args.agent_type)
+        simulator = PerformanceSimulator(args.environment, args.agent_type, args.seed)
         metrics = simulator.simulate_metrics(args.simulate_load, args.include_recent_swaps)
         
         # Ensure output directory exists
@@ -170,8 +308,7 @@ def main():
             os.makedirs(output_dir, exist_ok=True)
         
         # Save to file
-        with open(args.output_file, 'w') as f:
-            json.dump(metrics, f, indent=2)
+        dump_json(metrics, args.output_file, args.verbose)
         
         # Print success message
         log(f"✅ Metrics saved to {args.output_file}")
@@ -183,10 +320,10 @@ def main():
         
         # Show sample metrics
         if args.agent_type != 'all':
-            agent_key = f'{args.agent_type}_agent' if args.agent_type != 'communication' else 'communication_system'
+            agent_key = simulator.agents[0]
             if agent_key in metrics:
                 print(f"📋 Sample metrics for {args.agent_type}:")
-                for key, value in list(metrics[agent_key].items())[:3]:
+                for key, value in islice(metrics[agent_key].items(), 3):
                     print(f"   {key}: {value}")
         
         return 0
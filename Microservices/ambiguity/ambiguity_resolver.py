@@ -5,8 +5,11 @@ import json
 import re
 import uuid
 import os
+import sys
 import logging
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 
 from neuron.agent import DeliberativeAgent, ReflexAgent
 from neuron.circuit_designer import CircuitDefinition
@@ -14,6 +17,53 @@ from neuron.types import AgentType, ConnectionType
 from neuron.memory import Memory, MemoryType
 from ..base_microservice import BaseMicroservice
 
+
+def _compile_marker_patterns(markers):
+    """Compile every pattern of each category once, case-insensitively.
+    
+    Patterns stay separate so overlapping markers (e.g. "still" and "still not")
+    are each counted, exactly as per-pattern re.findall calls would count them.
+    Agents built from the same marker tables share one read-only compiled table.
+    """
+    return _compile_frozen_markers(tuple((category, tuple(patterns)) for category, patterns in markers.items()))
+
+
+@lru_cache(maxsize=None)
+def _compile_frozen_markers(markers):
+    return MappingProxyType({
+        category: tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+        for category, patterns in markers
+    })
+
+
+def _find_markers(regexes, text):
+    """Return the (category, matches) pairs of every category with a match in text, as tuples.
+    
+    Matches are listed pattern by pattern and interned: cached scans outlive the
+    request, and the same few marker phrases recur across nearly every cached query.
+    """
+    hits = []
+    for category, patterns in regexes.items():
+        matches = [match for pattern in patterns for match in pattern.findall(text)]
+        if matches:
+            hits.append((category, tuple(map(sys.intern, matches))))
+    return tuple(hits)
+
+
+# Support traffic repeats a long tail of canned phrases; marker scans are pure
+# functions of the text, so each agent memoizes them per distinct query.
+MARKER_CACHE_SIZE = 4096
+
+# No marker or intent phrase is shorter than this ("now", "bug", "add"), so
+# shorter or blank queries cannot match and skip the scans altogether.
+MIN_MARKER_LENGTH = 3
+
+
+def _is_trivial(text):
+    """Whether text is too short or blank to contain any marker."""
+    return len(text) < MIN_MARKER_LENGTH or text.isspace()
+
+
 class ToneAgent(DeliberativeAgent):
     """Agent for analyzing the tone of user messages."""
     
@@ -21,6 +71,9 @@ class ToneAgent(DeliberativeAgent):
         super().__init__(*args, **kwargs)
         self.politeness_markers = self._init_politeness_markers()
         self.urgency_markers = self._init_urgency_markers()
+        self._politeness_regexes = _compile_marker_patterns(self.politeness_markers)
+        self._urgency_regexes = _compile_marker_patterns(self.urgency_markers)
+        self._scan_markers = lru_cache(maxsize=MARKER_CACHE_SIZE)(self._scan_tone_markers)
         
     def _init_politeness_markers(self):
         """Initialize politeness marker patterns."""
@@ -87,6 +140,11 @@ class ToneAgent(DeliberativeAgent):
             }
         )
     
+    def _scan_tone_markers(self, text):
+        """Politeness and urgency marker matches in text."""
+        return (_find_markers(self._politeness_regexes, text),
+                _find_markers(self._urgency_regexes, text))
+    
     async def _analyze_tone(self, text):
         """Analyze the tone of a text message."""
         analysis = {
@@ -99,40 +157,29 @@ class ToneAgent(DeliberativeAgent):
             "tone_masking_detected": False
         }
         
+        politeness_hits, urgency_hits = ((), ()) if _is_trivial(text) else self._scan_markers(text)
+        
         # Count politeness markers
         politeness_count = 0
-        for category, patterns in self.politeness_markers.items():
-            detected = []
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
-                    detected.extend(matches)
-                    politeness_count += len(matches)
-            
-            if detected:
-                analysis["detected_patterns"]["politeness"].append({
-                    "category": category,
-                    "instances": detected
-                })
+        for category, detected in politeness_hits:
+            politeness_count += len(detected)
+            analysis["detected_patterns"]["politeness"].append({
+                "category": category,
+                "instances": list(detected)
+            })
         
         # Count urgency markers
         urgency_count = 0
-        for category, patterns in self.urgency_markers.items():
-            detected = []
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
-                    detected.extend(matches)
-                    urgency_count += len(matches)
-            
-            if detected:
-                analysis["detected_patterns"]["urgency"].append({
-                    "category": category,
-                    "instances": detected
-                })
+        for category, detected in urgency_hits:
+            urgency_count += len(detected)
+            analysis["detected_patterns"]["urgency"].append({
+                "category": category,
+                "instances": list(detected)
+            })
         
         # Calculate scores
-        text_length = len(text.split())
+        # Only the first 20 words affect the factor; maxsplit stops splitting after them
+        text_length = len(text.split(maxsplit=20))
         politeness_factor = 1.0 if text_length < 10 else min(20.0, text_length) / 20.0
         
         analysis["politeness_score"] = min(1.0, politeness_count / (5.0 * politeness_factor))
@@ -374,6 +421,8 @@ class IntentResolver(DeliberativeAgent):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.intent_patterns = self._init_intent_patterns()
+        self._intent_regexes = _compile_marker_patterns(self.intent_patterns)
+        self._scan_intents = lru_cache(maxsize=MARKER_CACHE_SIZE)(self._scan_intent_markers)
         self.memory = Memory(MemoryType.SHORT_TERM)
     
     def _init_intent_patterns(self):
@@ -420,6 +469,10 @@ class IntentResolver(DeliberativeAgent):
             }
         )
     
+    def _scan_intent_markers(self, text):
+        """Intent pattern matches in text."""
+        return _find_markers(self._intent_regexes, text)
+    
     async def _resolve_intent(self, text, tone_analysis):
         """Resolve the true intent behind a user message."""
         analysis = {
@@ -430,34 +483,26 @@ class IntentResolver(DeliberativeAgent):
             "ambiguity_level": 0.0
         }
         
-        # Detect intents
+        # Detect intents, keeping the two highest scores as we go
         intent_scores = {}
-        for intent, patterns in self.intent_patterns.items():
-            score = 0
-            matches = []
-            for pattern in patterns:
-                pattern_matches = re.findall(pattern, text, re.IGNORECASE)
-                if pattern_matches:
-                    matches.extend(pattern_matches)
-                    score += len(pattern_matches)
-            
-            if score > 0:
-                intent_scores[intent] = score
-                analysis["detected_intents"][intent] = {
-                    "score": score,
-                    "matches": matches
-                }
+        primary_intent, primary_score, runner_up_score = None, 0, 0
+        for intent, matches in (() if _is_trivial(text) else self._scan_intents(text)):
+            score = len(matches)
+            intent_scores[intent] = score
+            analysis["detected_intents"][intent] = {
+                "score": score,
+                "matches": list(matches)
+            }
+            if score > primary_score:
+                primary_intent, primary_score, runner_up_score = intent, score, primary_score
+            elif score > runner_up_score:
+                runner_up_score = score
         
         # Find primary intent
         if intent_scores:
-            primary_intent = max(intent_scores, key=intent_scores.get)
-            primary_score = intent_scores[primary_intent]
-            
             # Calculate confidence based on difference between primary and secondary intents
-            all_scores = list(intent_scores.values())
-            if len(all_scores) > 1:
-                all_scores.sort(reverse=True)
-                score_difference = all_scores[0] - all_scores[1]
+            if len(intent_scores) > 1:
+                score_difference = primary_score - runner_up_score
                 confidence = min(1.0, 0.5 + (score_difference / 5.0))
             else:
                 confidence = min(1.0, 0.5 + (primary_score / 5.0))
@@ -473,7 +518,6 @@ class IntentResolver(DeliberativeAgent):
             analysis["ambiguity_level"] = 0.2  # Low ambiguity with single intent
         else:
             # Calculate ambiguity based on intent score distribution
-            primary_score = max(intent_scores.values())
             total_score = sum(intent_scores.values())
             score_ratio = primary_score / total_score if total_score > 0 else 0
             
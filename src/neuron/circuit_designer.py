@@ -77,6 +77,22 @@ class Connection:
         )
 
 
+def _connection_def(source: str, target: str,
+                    connection_type: str = ConnectionType.DIRECT.value) -> Dict[str, Any]:
+    """
+    Build a connection definition entry for a circuit or template definition.
+    
+    Args:
+        source: Definition ID of the source agent
+        target: Definition ID of the target agent
+        connection_type: ConnectionType value of the connection
+        
+    Returns:
+        Connection definition dictionary
+    """
+    return {"source": source, "target": target, "connection_type": connection_type}
+
+
 class CircuitValidator:
     """
     Validates circuit designs before deployment.
@@ -195,6 +211,24 @@ class CircuitValidator:
         return errors
 
 
+def _message_predicate(condition: Union[str, Callable[[Message], bool]]) -> Callable[[Message], bool]:
+    """
+    Turn a connection condition into a message predicate.
+    
+    Callables are used as-is; string expressions over ``message`` are compiled
+    once into a lambda, so routing never re-parses source per message.
+    
+    Args:
+        condition: Predicate callable or Python expression over ``message``
+        
+    Returns:
+        Callable taking a message and returning whether it matches
+    """
+    if callable(condition):
+        return condition
+    return eval(f"lambda message: {condition}")
+
+
 class Circuit:
     """
     Runtime representation of an agent circuit.
@@ -412,7 +446,7 @@ class Circuit:
                     # Convert filter condition string to lambda (simplified)
                     # In a real implementation, this would use a safer evaluation mechanism
                     try:
-                        condition = eval(f"lambda message: {filter_condition}")
+                        condition = _message_predicate(filter_condition)
                         await self._synaptic_bus.add_routing_rule(condition, actual_target)
                     except Exception as e:
                         logger.error(f"Error creating filter condition: {e}")
@@ -433,7 +467,7 @@ class Circuit:
                 condition_code = metadata.get("condition_code")
                 if condition_code:
                     try:
-                        condition = eval(f"lambda message: {condition_code}")
+                        condition = _message_predicate(condition_code)
                         await self._synaptic_bus.add_routing_rule(condition, actual_target)
                     except Exception as e:
                         logger.error(f"Error creating condition: {e}")
@@ -610,6 +644,15 @@ class Circuit:
         """
         return self._agents.copy()
     
+    def get_agent_count(self) -> int:
+        """
+        Get the number of agents created for this circuit.
+        
+        Returns:
+            Number of deployed agents, without copying the agent mapping
+        """
+        return len(self._agents)
+    
     def get_status(self) -> str:
         """
         Get the current status of the circuit.
@@ -808,6 +851,9 @@ class CircuitDesigner:
     
     def _load_built_in_templates(self) -> None:
         """Load built-in circuit templates."""
+        # Worker agents of the star network, each wired to and from the coordinator
+        star_workers = ["worker1", "worker2", "worker3"]
+        
         # Define built-in templates
         templates = [
             {
@@ -843,21 +889,9 @@ class CircuitDesigner:
                         }
                     },
                     "connections": [
-                        {
-                            "source": "input",
-                            "target": "processor1",
-                            "connection_type": "direct"
-                        },
-                        {
-                            "source": "processor1",
-                            "target": "processor2",
-                            "connection_type": "direct"
-                        },
-                        {
-                            "source": "processor2",
-                            "target": "output",
-                            "connection_type": "direct"
-                        }
+                        _connection_def("input", "processor1"),
+                        _connection_def("processor1", "processor2"),
+                        _connection_def("processor2", "output")
                     ],
                     "metadata": {
                         "template": "sequential_pipeline"
@@ -909,46 +943,10 @@ class CircuitDesigner:
                         }
                     },
                     "connections": [
-                        {
-                            "source": "input",
-                            "target": "coordinator",
-                            "connection_type": "direct"
-                        },
-                        {
-                            "source": "coordinator",
-                            "target": "worker1",
-                            "connection_type": "direct"
-                        },
-                        {
-                            "source": "coordinator",
-                            "target": "worker2",
-                            "connection_type": "direct"
-                        },
-                        {
-                            "source": "coordinator",
-                            "target": "worker3",
-                            "connection_type": "direct"
-                        },
-                        {
-                            "source": "worker1",
-                            "target": "coordinator",
-                            "connection_type": "direct"
-                        },
-                        {
-                            "source": "worker2",
-                            "target": "coordinator",
-                            "connection_type": "direct"
-                        },
-                        {
-                            "source": "worker3",
-                            "target": "coordinator",
-                            "connection_type": "direct"
-                        },
-                        {
-                            "source": "coordinator",
-                            "target": "output",
-                            "connection_type": "direct"
-                        }
+                        _connection_def("input", "coordinator"),
+                        *(_connection_def("coordinator", worker) for worker in star_workers),
+                        *(_connection_def(worker, "coordinator") for worker in star_workers),
+                        _connection_def("coordinator", "output")
                     ],
                     "metadata": {
                         "template": "star_network"
@@ -1336,11 +1336,10 @@ class NeuroMonitor:
                 ))
                 
                 # Agent count
-                agent_mapping = circuit.get_agent_mapping()
                 metrics.append(Metric(
                     name=f"circuit.{circuit_id}.agent_count",
                     metric_type=MetricType.GAUGE,
-                    value=len(agent_mapping),
+                    value=circuit.get_agent_count(),
                     tags={"component": "circuit", "circuit_id": circuit_id}
                 ))
         except Exception as e:
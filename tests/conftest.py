@@ -0,0 +1,13 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The microservices are imported as packages from the repository root
+sys.path.insert(0, ROOT)
+
+# The workflow scripts are standalone modules, not an installed package
+sys.path.insert(0, os.path.join(ROOT, '.github', 'scripts'))
+
+# The neuron package lives under src/ (see setup.cfg package_dir)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
@@ -0,0 +1,55 @@
+import asyncio
+import importlib
+import sys
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+
+
+class _Agent:
+    """Stand-in for the neuron agent base classes"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+def _module(name, **attrs):
+    module = ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+# neuron does not import in this tree (neuron_core.py has an unterminated
+# docstring), so the resolver is loaded against stand-ins for what it uses
+NEURON_STUBS = {
+    'neuron': _module('neuron'),
+    'neuron.agent': _module('neuron.agent', DeliberativeAgent=_Agent, ReflexAgent=_Agent),
+    'neuron.circuit_designer': _module('neuron.circuit_designer', CircuitDefinition=object),
+    'neuron.types': _module('neuron.types', AgentType=object, ConnectionType=object),
+    'neuron.memory': _module('neuron.memory', Memory=_Agent, MemoryType=SimpleNamespace(SHORT_TERM='short_term')),
+}
+
+with mock.patch.dict(sys.modules, NEURON_STUBS):
+    ambiguity_resolver = importlib.import_module('Microservices.ambiguity.ambiguity_resolver')
+
+
+def _repeats(tone_analysis):
+    return next(category for category in tone_analysis['detected_patterns']['urgency']
+                if category['category'] == 'repeats')
+
+
+def test_overlapping_markers_counted_per_pattern():
+    agent = ambiguity_resolver.ToneAgent(name='Test Tone Agent')
+
+    # "still", "still not" and "not working" overlap but are separate markers
+    tone_analysis = asyncio.run(agent._analyze_tone('It is still not working again'))
+
+    assert _repeats(tone_analysis)['instances'] == ['again', 'still', 'not working', 'still not']
+    assert tone_analysis['urgency_score'] == 1.0
+
+
+def test_agents_share_compiled_marker_tables():
+    first = ambiguity_resolver.ToneAgent(name='first')
+    second = ambiguity_resolver.ToneAgent(name='second')
+
+    assert first._urgency_regexes is second._urgency_regexes
+    assert all(isinstance(patterns, tuple) for patterns in first._urgency_regexes.values())
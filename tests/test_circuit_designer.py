@@ -0,0 +1,52 @@
+import ast
+import os
+from types import SimpleNamespace
+from typing import Any, Callable, Union
+
+CIRCUIT_DESIGNER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'src', 'neuron', 'circuit_designer.py')
+
+
+def _load_message_predicate():
+    """Import _message_predicate, or compile just its definition if the module does not parse
+
+    circuit_designer.py (and neuron_core.py, which the package imports first)
+    currently contain unterminated triple-quoted strings, so the function is
+    lifted out of the source on its own rather than leaving it untested.
+    """
+    try:
+        from neuron.circuit_designer import _message_predicate
+        return _message_predicate
+    except (ImportError, SyntaxError):
+        pass
+
+    with open(CIRCUIT_DESIGNER, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    start = next(i for i, line in enumerate(lines) if line.startswith('def _message_predicate('))
+    end = next(i for i in range(start + 1, len(lines)) if lines[i] and not lines[i][0].isspace())
+    namespace = {'Any': Any, 'Callable': Callable, 'Union': Union, 'Message': Any}
+    exec(compile(ast.parse('\n'.join(lines[start:end])), CIRCUIT_DESIGNER, 'exec'), namespace)
+    return namespace['_message_predicate']
+
+
+_message_predicate = _load_message_predicate()
+
+
+def _message(**content):
+    return SimpleNamespace(content=content)
+
+
+def test_string_predicate_is_compiled_over_message():
+    predicate = _message_predicate("message.content.get('priority', 0) > 5")
+    assert callable(predicate)
+    assert predicate(_message(priority=7))
+    assert not predicate(_message(priority=3))
+    assert not predicate(_message())
+
+
+def test_callable_predicate_is_used_as_is():
+    def high_priority(message):
+        return message.content.get('priority', 0) > 5
+    predicate = _message_predicate(high_priority)
+    assert predicate is high_priority
+    assert predicate(_message(priority=9))
@@ -0,0 +1,181 @@
+import asyncio
+import json
+
+import pytest
+
+import hot_swap_memory
+from hot_swap_memory import MemoryAgentSwapper
+
+HEALTHY = {'response_time': 150, 'error_rate': 0.005, 'memory_usage': 0.5, 'cpu_usage': 0.4, 'cache_hit_rate': 0.9}
+HIGH_ERROR_RATE = {**HEALTHY, 'error_rate': 0.05}
+
+_real_sleep = asyncio.sleep
+
+
+async def _no_wait(delay, *args, **kwargs):
+    await _real_sleep(0)
+
+
+async def _passed(check):
+    return check, True
+
+
+def _stub_health(monkeypatch, *samples):
+    """Feed the given health samples, repeating the last one once they run out"""
+    remaining = list(samples)
+    taken = []
+
+    def sample(self):
+        metrics = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        taken.append(metrics)
+        return dict(metrics)
+
+    monkeypatch.setattr(MemoryAgentSwapper, '_sample_health_metrics', sample)
+    return taken
+
+
+@pytest.fixture
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(hot_swap_memory, 'HEALTH_POLL_INTERVAL', 0.01)
+
+
+def test_post_swap_validation_exits_once_stable(monkeypatch, fast_polling):
+    taken = _stub_health(monkeypatch, HEALTHY)
+
+    result = asyncio.run(MemoryAgentSwapper(seed=1)._post_swap_validation('v2', 120))
+
+    assert result.status == 'success'
+    assert result.extras['samples_taken'] == hot_swap_memory.HEALTH_STABLE_SAMPLES
+    assert len(taken) == hot_swap_memory.HEALTH_STABLE_SAMPLES
+    assert result.duration_ms < 1000
+
+
+def test_post_swap_validation_stops_at_the_validation_window(monkeypatch, fast_polling):
+    monkeypatch.setattr(hot_swap_memory, 'HEALTH_STABLE_SAMPLES', 1000)
+    _stub_health(monkeypatch, HEALTHY)
+
+    # --validation-time 1 scales down to a 0.05s window
+    result = asyncio.run(MemoryAgentSwapper(seed=1)._post_swap_validation('v2', 1))
+
+    assert result.status == 'success'
+    assert 1 <= result.extras['samples_taken'] < 1000
+    assert result.duration_ms < 500
+
+
+def test_post_swap_validation_fails_on_first_breach(monkeypatch, fast_polling):
+    taken = _stub_health(monkeypatch, HEALTHY, HIGH_ERROR_RATE, HEALTHY)
+
+    result = asyncio.run(MemoryAgentSwapper(seed=1)._post_swap_validation('v2', 120))
+
+    assert result.status == 'failed'
+    assert result.extras['samples_taken'] == 2
+    assert result.extras['failure_reason'] == 'High error rate detected'
+    assert len(taken) == 2
+
+
+def test_failed_validation_rolls_back(monkeypatch, tmp_path, fast_polling):
+    monkeypatch.setattr(hot_swap_memory.asyncio, 'sleep', _no_wait)
+    monkeypatch.setattr(MemoryAgentSwapper, '_run_pre_swap_check', lambda self, check, rate: _passed(check))
+    _stub_health(monkeypatch, HIGH_ERROR_RATE)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GITHUB_OUTPUT', str(tmp_path / 'github_output'))
+    monkeypatch.setattr('sys.argv', ['hot_swap_memory.py', '--from-version', 'v1', '--to-version', 'v2',
+                                     '--environment', 'staging', '--validation-time', '1', '--seed', '1'])
+
+    assert hot_swap_memory.main() == 0
+
+    result = json.loads((tmp_path / 'memory_swap_results.json').read_text())
+    assert result['swap_status'] == 'rolled_back'
+    assert result['final_version'] == 'v1'
+    assert [phase['phase'] for phase in result['phases']] == [
+        'pre_validation', 'deployment', 'traffic_switch', 'validation', 'rollback']
+    assert result['phases'][-1]['prestaged'] is True
+    assert 'swap_status=rolled_back\n' in (tmp_path / 'github_output').read_text()
+
+
+async def _memory_check_fails(check):
+    return check, check != 'Memory availability'
+
+
+@pytest.mark.parametrize('strategy', hot_swap_memory.SWAP_STRATEGIES)
+def test_failed_pre_validation_never_deploys(monkeypatch, strategy):
+    monkeypatch.setattr(hot_swap_memory.asyncio, 'sleep', _no_wait)
+    monkeypatch.setattr(MemoryAgentSwapper, '_run_pre_swap_check', lambda self, check, rate: _memory_check_fails(check))
+    deployments = []
+
+    async def deploy(self, version, environment):
+        deployments.append('started')
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            deployments.append('cancelled')
+            raise
+
+    monkeypatch.setattr(MemoryAgentSwapper, '_deploy_new_version', deploy)
+
+    async def swap():
+        result = await MemoryAgentSwapper(seed=1).perform_swap('v1', 'v2', strategy, 'staging', 1)
+        await _real_sleep(0)  # let a cancelled deployment unwind
+        return result
+
+    result = asyncio.run(swap())
+
+    assert result['swap_status'] == 'failed'
+    assert result['final_version'] == 'v1'
+    assert [phase['phase'] for phase in result['phases']] == ['pre_validation', 'rollback']
+    # Only blue-green starts deploying during pre-validation, and it is called off
+    assert deployments == (['started', 'cancelled'] if strategy == 'blue-green' else [])
+
+
+@pytest.fixture
+def fast_canary(monkeypatch):
+    monkeypatch.setattr(hot_swap_memory, 'CANARY_SHIFT_TIME', 0)
+    monkeypatch.setattr(hot_swap_memory, 'CANARY_OBSERVATION_WINDOW', 0)
+
+
+def test_canary_promotes_through_every_step_while_healthy(monkeypatch, fast_canary):
+    taken = _stub_health(monkeypatch, HEALTHY)
+    staged = []
+    prepare_traffic_shift = MemoryAgentSwapper._prepare_traffic_shift
+
+    async def record_shift(self, percent):
+        staged.append(percent)
+        return await prepare_traffic_shift(self, percent)
+
+    monkeypatch.setattr(MemoryAgentSwapper, '_prepare_traffic_shift', record_shift)
+
+    result = asyncio.run(MemoryAgentSwapper(seed=1)._canary_swap('v1', 'v2'))
+
+    assert result.status == 'success'
+    assert [percent for _, percent in result.extras['canary_steps']] == list(hot_swap_memory.CANARY_TRAFFIC_STEPS)
+    assert result.extras['traffic_split'] == {'stable': 0, 'canary': 100}
+    assert len(taken) == len(hot_swap_memory.CANARY_TRAFFIC_STEPS)
+    assert staged == list(hot_swap_memory.CANARY_TRAFFIC_STEPS)
+    assert result.extras['canary_steps'] == [(f'{percent}% canary traffic', percent) for percent in staged]
+
+
+@pytest.mark.parametrize('healthy_steps', range(len(hot_swap_memory.CANARY_TRAFFIC_STEPS)))
+def test_canary_aborts_at_the_first_unhealthy_step(monkeypatch, fast_canary, healthy_steps):
+    taken = _stub_health(monkeypatch, *([HEALTHY] * healthy_steps), HIGH_ERROR_RATE)
+
+    result = asyncio.run(MemoryAgentSwapper(seed=1)._canary_swap('v1', 'v2'))
+
+    assert result.status == 'failed'
+    assert result.extras['aborted_at_percent'] == hot_swap_memory.CANARY_TRAFFIC_STEPS[healthy_steps]
+    applied = hot_swap_memory.CANARY_TRAFFIC_STEPS[:healthy_steps + 1]
+    assert [percent for _, percent in result.extras['canary_steps']] == list(applied)
+    assert result.extras['traffic_split'] == {'stable': 100, 'canary': 0}
+    assert len(taken) == healthy_steps + 1
+
+
+def test_aborted_canary_rolls_the_swap_back(monkeypatch, fast_canary):
+    monkeypatch.setattr(hot_swap_memory.asyncio, 'sleep', _no_wait)
+    monkeypatch.setattr(MemoryAgentSwapper, '_run_pre_swap_check', lambda self, check, rate: _passed(check))
+    _stub_health(monkeypatch, HEALTHY, HIGH_ERROR_RATE)
+
+    result = asyncio.run(MemoryAgentSwapper(seed=1).perform_swap('v1', 'v2', 'canary', 'staging', 1))
+
+    assert result['swap_status'] == 'failed'
+    assert result['final_version'] == 'v1'
+    assert [phase['phase'] for phase in result['phases']] == ['pre_validation', 'deployment', 'traffic_switch', 'rollback']
+    assert result['phases'][2]['aborted_at_percent'] == 50
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+import performance_decision
+from performance_decision import PerformanceDecisionEngine
+
+
+@pytest.fixture
+def engine():
+    return PerformanceDecisionEngine()
+
+
+@pytest.mark.parametrize('component, metrics, expected', [
+    ('memory_agent', {'response_time_ms': 450, 'cpu_usage': 0.5, 'memory_usage': 0.5}, 'performance'),
+    ('memory_agent', {'response_time_ms': 100, 'cpu_usage': 0.8, 'memory_usage': 0.8}, 'efficiency'),
+    ('memory_agent', {'response_time_ms': 100, 'cpu_usage': 0.5, 'memory_usage': 0.5}, 'stability'),
+    ('reasoning_agent', {'response_time_ms': 900, 'decision_accuracy': 0.85, 'cpu_usage': 0.8}, 'performance'),
+    ('reasoning_agent', {'response_time_ms': 100, 'decision_accuracy': 0.95, 'cpu_usage': 0.8}, 'efficiency'),
+    ('reasoning_agent', {'response_time_ms': 100, 'decision_accuracy': 0.95, 'cpu_usage': 0.5}, 'stability'),
+    ('communication_system', {'message_throughput': 500, 'avg_latency_ms': 10}, 'performance'),
+    ('communication_system', {'message_throughput': 1000, 'avg_latency_ms': 10}, 'stability'),
+    ('unknown', {'cpu_usage': 0.99}, 'stability'),
+])
+def test_optimization_type_per_component(engine, component, metrics, expected):
+    assert engine._determine_optimization_type(component, metrics) == expected
+
+
+@pytest.mark.parametrize('component, metrics', [
+    ('memory', {'response_time_ms': 450, 'cpu_usage': 0.9, 'memory_usage': 0.9}),
+    ('reasoning', {'response_time_ms': 900, 'decision_accuracy': 0.85, 'cpu_usage': 0.8}),
+    ('communication', {'message_throughput': 500, 'avg_latency_ms': 10}),
+])
+def test_recommendations_use_the_stability_ranking(engine, component, metrics):
+    # _recommend_version passes the short component names, which the issue counters do not match
+    assert engine._determine_optimization_type(component, metrics) == 'stability'
+    recommendation = engine._recommend_version(component, metrics, 0.4)
+    assert recommendation['reason'].startswith('stability optimization needed')
+
+
+ANALYSIS_KEYS = ['timestamp', 'threshold', 'action', 'component_scores', 'swap_needed', 'recommendations',
+                 'target_agent', 'current_version', 'recommended_version', 'swap_reason',
+                 'performance_score', 'confidence']
+
+
+def test_analysis_output_keys(engine):
+    analysis = engine.analyze_performance({'memory_agent': {'cpu_usage': 0.5}}, 0.7, 'monitor_only')
+    assert list(analysis) == ANALYSIS_KEYS
+
+
+def test_failed_analysis_reports_error_without_recommendations(engine):
+    analysis = engine.analyze_performance(None, 0.7, 'monitor_only')
+    assert list(analysis) == [key for key in ANALYSIS_KEYS if key != 'recommendations'] + ['error']
+    assert analysis['swap_reason'].startswith('Analysis failed: ')
+
+
+def test_cached_analysis_is_not_shared_with_callers(engine):
+    metrics = {'memory_agent': {'cpu_usage': 0.99, 'memory_usage': 0.99, 'response_time_ms': 900}}
+    first = engine.analyze_performance(metrics, 0.9, 'monitor_only')
+    first['recommendations'].clear()
+    first['component_scores'].clear()
+    second = engine.analyze_performance(metrics, 0.9, 'monitor_only')
+    assert second['recommendations'] and second['component_scores']
+
+
+def test_analysis_cache_is_per_engine():
+    metrics = {'memory_agent': {'cpu_usage': 0.5, 'memory_usage': 0.5, 'response_time_ms': 200,
+                                'error_rate': 0.01, 'cache_hit_rate': 0.9}}
+    first, second = PerformanceDecisionEngine(), PerformanceDecisionEngine()
+    first.analyze_performance(metrics, 0.7, 'monitor_only')
+    first.analyze_performance(metrics, 0.7, 'monitor_only')
+    assert first._analyze_cached.cache_info().hits == 1
+    assert second._analyze_cached.cache_info().currsize == 0
+
+
+HEALTHY_METRICS = {'memory_agent': {'cpu_usage': 0.5, 'memory_usage': 0.5, 'response_time_ms': 200,
+                                    'error_rate': 0.01, 'cache_hit_rate': 0.9}}
+
+
+def _write_metrics(directory, name, content):
+    path = directory / name
+    path.write_text(content)
+    return path
+
+
+def test_analyze_batch_writes_one_analysis_per_file(tmp_path):
+    for name in ('staging.json', 'production.json'):
+        _write_metrics(tmp_path, name, json.dumps(HEALTHY_METRICS))
+    out_dir = tmp_path / 'out'
+    
+    assert performance_decision.analyze_batch(str(tmp_path / '*.json'), str(out_dir), 0.7, 'monitor_only') == 0
+    assert sorted(p.name for p in out_dir.iterdir()) == ['production_analysis.json', 'staging_analysis.json']
+    analyses = [json.loads(p.read_text()) for p in out_dir.iterdir()]
+    assert all(analysis['threshold'] == 0.7 for analysis in analyses)
+    assert analyses[0]['timestamp'] == analyses[1]['timestamp']
+
+
+def test_analyze_batch_without_matches_fails(tmp_path):
+    out_dir = tmp_path / 'out'
+    assert performance_decision.analyze_batch(str(tmp_path / '*.json'), str(out_dir), 0.7, 'monitor_only') == 1
+    assert list(out_dir.iterdir()) == []
+
+
+def test_analyze_batch_reports_unparseable_files(tmp_path):
+    _write_metrics(tmp_path, 'good.json', json.dumps(HEALTHY_METRICS))
+    _write_metrics(tmp_path, 'broken.json', '{"memory_agent": ')
+    out_dir = tmp_path / 'out'
+    
+    assert performance_decision.analyze_batch(str(tmp_path / '*.json'), str(out_dir), 0.7, 'monitor_only') == 1
+    assert [p.name for p in out_dir.iterdir()] == ['good_analysis.json']
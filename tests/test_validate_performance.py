@@ -0,0 +1,147 @@
+import json
+import sys
+
+import pytest
+
+import validate_performance
+from validate_performance import PerformanceValidator
+
+BASELINE = {
+    'memory_agent': {'cpu_usage': 0.65, 'memory_usage': 0.73, 'response_time_ms': 241.1,
+                     'cache_hit_rate': 0.89, 'error_rate': 0.02, 'throughput': 446.5},
+    'reasoning_agent': {'cpu_usage': 0.72, 'memory_usage': 0.59, 'response_time_ms': 804.0,
+                        'decision_accuracy': 0.88, 'error_rate': 0.01, 'throughput': 200.8},
+    'communication_system': {'cpu_usage': 0.39, 'memory_usage': 0.51, 'throughput': 882.3,
+                             'latency_ms': 14.9, 'message_loss_rate': 0.0001, 'queue_depth': 29.7},
+}
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in tmp_path with a baseline file and a GITHUB_OUTPUT file"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GITHUB_OUTPUT', str(tmp_path / 'github_output'))
+    (tmp_path / 'baseline.json').write_text(json.dumps(BASELINE))
+    return tmp_path
+
+
+def run_main(monkeypatch, *args):
+    """Run validate_performance.main() with args, returning its exit code"""
+    monkeypatch.setattr(sys, 'argv', ['validate_performance.py', *args])
+    with pytest.raises(SystemExit) as exit_info:
+        validate_performance.main()
+    return exit_info.value.code
+
+
+def github_outputs(workdir):
+    return dict(line.split('=', 1) for line in (workdir / 'github_output').read_text().splitlines())
+
+
+def _resource_check_fails(self, component, expected_version, baseline_metrics):
+    return {'check': 'resource_utilization', 'status': 'failed', 'message': 'forced failure', 'compliant': False}
+
+
+def _must_not_run(self, *args):
+    raise AssertionError('check ran after an earlier failure with --fail-fast')
+
+
+def test_fail_fast_reports_skipped_checks(workdir, monkeypatch):
+    monkeypatch.setattr(PerformanceValidator, '_check_resource_utilization', _resource_check_fails)
+    monkeypatch.setattr(PerformanceValidator, '_check_performance_metrics', _must_not_run)
+    monkeypatch.setattr(PerformanceValidator, '_check_sla_compliance', _must_not_run)
+
+    code = run_main(monkeypatch, '--component', 'memory', '--expected-version', 'v2',
+                    '--baseline-metrics', 'baseline.json', '--validation-duration', '10', '--fail-fast')
+
+    assert code == 1
+    checks = json.loads((workdir / 'memory_validation_results.json').read_text())['checks']
+    assert [(check['check'], check['status'], check['compliant']) for check in checks] == [
+        ('resource_utilization', 'failed', False),
+        ('performance_metrics', 'skipped', None),
+        ('sla_compliance', 'skipped', None),
+    ]
+
+
+def test_without_fail_fast_every_check_runs(workdir, monkeypatch):
+    monkeypatch.setattr(PerformanceValidator, '_check_resource_utilization', _resource_check_fails)
+
+    run_main(monkeypatch, '--component', 'memory', '--expected-version', 'v2',
+             '--baseline-metrics', 'baseline.json', '--validation-duration', '10', '--seed', '1')
+
+    checks = json.loads((workdir / 'memory_validation_results.json').read_text())['checks']
+    assert [check['check'] for check in checks] == ['resource_utilization', 'performance_metrics', 'sla_compliance']
+    assert 'skipped' not in {check['status'] for check in checks}
+
+
+def test_batch_validates_every_component(workdir, monkeypatch):
+    batch = [
+        {'component': 'memory'},
+        {'component': 'reasoning', 'expected_version': 'v2.1-fast'},
+        {'component': 'communication', 'duration': 20},
+    ]
+    (workdir / 'swaps.json').write_text(json.dumps(batch))
+
+    code = run_main(monkeypatch, '--batch', 'swaps.json', '--expected-version', 'v2',
+                    '--baseline-metrics', 'baseline.json', '--validation-duration', '10', '--seed', '3')
+
+    results = json.loads((workdir / 'swaps_validation_results.json').read_text())
+    assert [result['component'] for result in results['results']] == ['memory', 'reasoning', 'communication']
+    assert [result['expected_version'] for result in results['results']] == ['v2', 'v2.1-fast', 'v2']
+    passed = sum(result['status'] == 'passed' for result in results['results'])
+    assert results['message'] == f"{passed}/3 components passed validation."
+    assert results['status'] == ('passed' if passed == 3 else 'failed')
+    assert code == (0 if passed == 3 else 1)
+
+
+def test_history_file_appends_one_line_per_run(workdir, monkeypatch):
+    for seed in ('1', '2'):
+        run_main(monkeypatch, '--component', 'communication', '--expected-version', 'v3.1',
+                 '--baseline-metrics', 'baseline.json', '--validation-duration', '10',
+                 '--seed', seed, '--history-file', 'history.jsonl')
+
+    lines = (workdir / 'history.jsonl').read_text().splitlines()
+    assert len(lines) == 2
+    records = [json.loads(line) for line in lines]
+    assert all(record['component'] == 'communication' for record in records)
+    assert records[-1] == json.loads((workdir / 'communication_validation_results.json').read_text())
+
+
+def test_github_outputs_are_written(workdir, monkeypatch):
+    code = run_main(monkeypatch, '--component', 'reasoning', '--expected-version', 'v2',
+                    '--baseline-metrics', 'baseline.json', '--validation-duration', '10', '--seed', '5')
+
+    results = json.loads((workdir / 'reasoning_validation_results.json').read_text())
+    assert github_outputs(workdir) == {
+        'validation_passed': 'true' if results['status'] == 'passed' else 'false',
+        'validation_status': results['status'],
+        'validation_message': results['message'],
+    }
+    assert code == (0 if results['status'] == 'passed' else 1)
+
+
+def test_set_github_outputs_appends_in_one_write(tmp_path, monkeypatch):
+    output_file = tmp_path / 'github_output'
+    output_file.write_text('earlier=1\n')
+    monkeypatch.setenv('GITHUB_OUTPUT', str(output_file))
+
+    validate_performance.set_github_outputs({'validation_passed': 'false', 'validation_status': 'failed'})
+
+    assert output_file.read_text() == 'earlier=1\nvalidation_passed=false\nvalidation_status=failed\n'
+
+
+def test_set_github_outputs_falls_back_to_stdout(monkeypatch, capsys):
+    monkeypatch.delenv('GITHUB_OUTPUT', raising=False)
+
+    validate_performance.set_github_outputs({'validation_status': 'passed'})
+
+    assert capsys.readouterr().out == 'OUTPUT: validation_status=passed\n'
+
+
+def test_negative_duration_runs_no_checks(workdir, monkeypatch):
+    code = run_main(monkeypatch, '--component', 'memory', '--expected-version', 'v2',
+                    '--baseline-metrics', 'baseline.json', '--validation-duration', '-30', '--seed', '1')
+
+    results = json.loads((workdir / 'memory_validation_results.json').read_text())
+    assert results['checks'] == []
+    assert results['status'] == 'passed'
+    assert code == 0